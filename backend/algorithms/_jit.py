@@ -0,0 +1,26 @@
+"""
+Optional Numba JIT support
+Kernels are decorated with njit; without numba they run as plain Python.
+Serial per-request kernels pass nogil=True so that a threaded server can
+run several requests' kernels on different cores at once. parallel=True
+kernels must be called while holding parallel_lock: numba's default
+workqueue threading layer aborts the process when two threads enter
+parallel regions at once.
+"""
+
+import threading
+
+parallel_lock = threading.Lock()
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -0,0 +1,91 @@
+"""
+Shared DNA sequence wrapper
+Encodes a sequence once and caches the derived forms the algorithms use
+"""
+
+import numpy as np
+
+# Byte -> nucleotide code lookup (A=0, C=1, G=2, T=3, anything else=4)
+_LUT = np.full(256, 4, dtype=np.uint8)
+for _code, _base in enumerate('ACGT'):
+    _LUT[ord(_base)] = _code
+    _LUT[ord(_base.lower())] = _code
+
+# Complement tables; case is preserved and other characters pass through
+_RC_TABLE = bytes.maketrans(b'ACGTacgtNn', b'TGCAtgcaNn')
+_RC_TABLE_STR = str.maketrans('ACGTacgtNn', 'TGCAtgcaNn')
+
+
+class Sequence:
+    """
+    Uppercase DNA sequence with lazily cached encodings
+
+    Pass the same Sequence to several algorithms to pay for uppercasing,
+    nucleotide encoding, GC prefix sums and the reverse complement once.
+    """
+
+    __slots__ = ('raw', '_text', '_arr', '_enc', '_sym', '_gc', '_rc')
+
+    def __init__(self, seq):
+        text = None
+        if isinstance(seq, str):
+            if not seq.isascii():
+                # Keep the characters for text; raw has a '?' for each one
+                text = seq = seq.upper()
+            seq = seq.encode('ascii', 'replace')
+        seq = bytes(seq)
+        # Endpoints pass already normalized sequences, which need no copy
+        self.raw = seq if seq.isupper() else seq.upper()
+        self._text = text
+        self._arr = self._enc = self._sym = self._gc = self._rc = None
+
+    def __len__(self):
+        return len(self.raw)
+
+    @property
+    def text(self):
+        """The uppercase sequence as a str"""
+        if self._text is None:
+            self._text = self.raw.decode('ascii')
+        return self._text
+
+    def array(self):
+        """Read-only uint8 view of the uppercase bytes"""
+        if self._arr is None:
+            self._arr = np.frombuffer(self.raw, dtype=np.uint8)
+        return self._arr
+
+    def enc(self):
+        """uint8 nucleotide codes (A=0, C=1, G=2, T=3, anything else=4)"""
+        if self._enc is None:
+            self._enc = _LUT[self.array()]
+        return self._enc
+
+    def symbols(self):
+        """Character codes of the uppercase sequence, equal only for equal characters"""
+        if self._sym is None:
+            if self._text is None or self._text.isascii():
+                self._sym = self.array()
+            else:
+                self._sym = np.frombuffer(self._text.encode('utf-32-le'), dtype=np.uint32)
+        return self._sym
+
+    def gc_prefix(self):
+        """List p where p[e] - p[s] is the number of G/C bases in [s, e)"""
+        if self._gc is None:
+            arr = self.array()
+            self._gc = [0] + np.cumsum((arr == ord('G')) | (arr == ord('C'))).tolist()
+        return self._gc
+
+    def rc(self):
+        """Reverse complement as uppercase bytes"""
+        if self._rc is None:
+            self._rc = self.raw.translate(_RC_TABLE)[::-1]
+        return self._rc
+
+
+def as_sequence(seq):
+    """Wrap a str or bytes in a Sequence; Sequence objects pass through"""
+    if isinstance(seq, Sequence):
+        return seq
+    return Sequence(seq)
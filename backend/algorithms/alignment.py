@@ -1,127 +1,406 @@
 """
-Sequence Alignment Algorithms - Pure Python
+Sequence Alignment Algorithms
 Implements Needleman-Wunsch (global) and Smith-Waterman (local) alignment
 """
 
-def needleman_wunsch(seq1, seq2, match_score=1, mismatch_penalty=-1, gap_penalty=-2):
+import functools
+
+import numpy as np
+
+from ._jit import HAVE_NUMBA, njit, parallel_lock, prange
+from ._seq import as_sequence
+
+try:
+    from ._align_simd import nw_fill as _nw_fill_simd
+except ImportError:  # optional C extension, see backend/setup.py
+    _nw_fill_simd = None
+
+try:
+    import parasail
+except ImportError:  # optional vectorized C aligner for backend='parasail'
+    parasail = None
+
+try:
+    from pywfa import WavefrontAligner
+except ImportError:  # optional WFA2-lib bindings for long, similar sequences
+    WavefrontAligner = None
+
+BACKENDS = ('builtin', 'parasail')
+
+# Global alignments longer than this try the wavefront aligner first
+WFA_MIN_LENGTH = 2000
+
+
+@njit(cache=True, nogil=True)
+def _nw_fill(a, b, ms, mm, gp, H):
     """
-    Needleman-Wunsch algorithm for global sequence alignment
+    Fill a Needleman-Wunsch matrix whose first row and column are set
     
-    Args:
-        seq1: First DNA sequence
-        seq2: Second DNA sequence
-        match_score: Score for matching nucleotides
-        mismatch_penalty: Penalty for mismatching nucleotides
-        gap_penalty: Penalty for gaps
-    
-    Returns:
-        tuple: (aligned_seq1, aligned_seq2, score)
+    H is the flat row-major (n+1) x (m+1) matrix; cell (i, j) is H[i*(m+1) + j].
+    """
+    n, m = a.shape[0], b.shape[0]
+    w = m + 1
+    for i in range(1, n + 1):
+        row = i * w
+        for j in range(1, m + 1):
+            k = row + j
+            match = H[k-w-1] + (ms if a[i-1] == b[j-1] else mm)
+            delete = H[k-w] + gp
+            insert = H[k-1] + gp
+            H[k] = max(match, delete, insert)
+
+
+def _sw_fill(a, b, ms, mm, gp, H):
     """
-    seq1 = seq1.upper()
-    seq2 = seq2.upper()
+    Fill a zero-initialized Smith-Waterman matrix one anti-diagonal at a time
     
+    Every cell on anti-diagonal d = i + j depends only on diagonals d-1 and
+    d-2, so each diagonal is computed with a handful of vectorized operations.
+    In the flat row-major buffer cell (i, j) sits at i*m + d, so a diagonal
+    and its three neighbours are plain strided slices rather than gathers.
+    """
+    n, m = a.shape[0], b.shape[0]
+    w = m + 1
+    for d in range(2, n + m + 1):
+        lo, hi = max(1, d - m), min(n, d - 1)
+        if lo > hi:
+            continue
+        start, stop = lo * m + d, hi * m + d + 1
+        diag = H[start-w-1:stop-w-1:m]
+        up = H[start-w:stop-w:m]
+        left = H[start-1:stop-1:m]
+        is_match = a[lo-1:hi] == b[d-hi-1:d-lo][::-1]
+        match = diag + np.where(is_match, ms, mm)
+        H[start:stop:m] = np.maximum(np.maximum(match, 0), np.maximum(up, left) + gp)
+
+
+@njit(cache=True, nogil=True)
+def _nw_score_row(a, b, ms, mm, gp):
+    """Last row of the Needleman-Wunsch matrix, using two rolling rows"""
+    n, m = a.shape[0], b.shape[0]
+    prev = np.arange(m + 1) * gp
+    cur = np.empty(m + 1, dtype=prev.dtype)
+    for i in range(1, n + 1):
+        cur[0] = i * gp
+        for j in range(1, m + 1):
+            match = prev[j-1] + (ms if a[i-1] == b[j-1] else mm)
+            cur[j] = max(match, prev[j] + gp, cur[j-1] + gp)
+        prev, cur = cur, prev
+    return prev
+
+
+@njit(parallel=True, cache=True)
+def _nw_batch_scores(A, La, B, Lb, ms, mm, gp, scores):
+    """Needleman-Wunsch score of each padded row pair, one pair per thread"""
+    for k in prange(A.shape[0]):
+        scores[k] = _nw_score_row(A[k, :La[k]], B[k, :Lb[k]], ms, mm, gp)[Lb[k]]
+
+
+def _pad_rows(seqs):
+    """Character codes of each Sequence as rows of a zero-padded 2-D array, with lengths"""
+    lengths = np.array([len(seq) for seq in seqs], dtype=np.int64)
+    codes = [seq.symbols() for seq in seqs]
+    rows = np.zeros((len(seqs), int(lengths.max(initial=0))), dtype=np.result_type(*codes))
+    for row, code in zip(rows, codes):
+        row[:code.size] = code
+    return rows, lengths
+
+
+def _nw_full(seq1, seq2, a, b, match_score, mismatch_penalty, gap_penalty):
+    """Needleman-Wunsch over the full score matrix, with traceback"""
     n, m = len(seq1), len(seq2)
     
-    # Initialize scoring matrix
-    score_matrix = [[0 for _ in range(m + 1)] for _ in range(n + 1)]
-    
-    # Initialize first row and column
-    for i in range(n + 1):
-        score_matrix[i][0] = gap_penalty * i
-    for j in range(m + 1):
-        score_matrix[0][j] = gap_penalty * j
+    # Initialize flat (n+1) x (m+1) scoring matrix with first row and column
+    w = m + 1
+    score_matrix = np.empty((n + 1) * w, dtype=np.int32)
+    score_matrix[:w] = np.arange(w) * gap_penalty
+    score_matrix[::w] = np.arange(n + 1) * gap_penalty
     
-    # Fill the scoring matrix
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            match = score_matrix[i-1][j-1] + (match_score if seq1[i-1] == seq2[j-1] else mismatch_penalty)
-            delete = score_matrix[i-1][j] + gap_penalty
-            insert = score_matrix[i][j-1] + gap_penalty
-            score_matrix[i][j] = max(match, delete, insert)
+    # Fill the scoring matrix (C extension only when numba is unavailable)
+    if _nw_fill_simd is not None and not HAVE_NUMBA and a.dtype == np.uint8 and b.dtype == np.uint8:
+        _nw_fill_simd(a, b, match_score, mismatch_penalty, gap_penalty, score_matrix)
+    else:
+        _nw_fill(a, b, match_score, mismatch_penalty, gap_penalty, score_matrix)
     
-    # Traceback
-    align1, align2 = '', ''
+    # Traceback (built in reverse, joined once at the end)
+    codes1, codes2 = a.tolist(), b.tolist()
+    align1, align2 = [], []
     i, j = n, m
+    k = i * w + j
     
     while i > 0 or j > 0:
-        current_score = score_matrix[i][j]
+        current_score = score_matrix[k]
         
-        if i > 0 and j > 0 and current_score == score_matrix[i-1][j-1] + (match_score if seq1[i-1] == seq2[j-1] else mismatch_penalty):
-            align1 = seq1[i-1] + align1
-            align2 = seq2[j-1] + align2
+        if i > 0 and j > 0 and current_score == score_matrix[k-w-1] + (match_score if codes1[i-1] == codes2[j-1] else mismatch_penalty):
+            align1.append(seq1[i-1])
+            align2.append(seq2[j-1])
             i -= 1
             j -= 1
-        elif i > 0 and current_score == score_matrix[i-1][j] + gap_penalty:
-            align1 = seq1[i-1] + align1
-            align2 = '-' + align2
+            k -= w + 1
+        elif i > 0 and current_score == score_matrix[k-w] + gap_penalty:
+            align1.append(seq1[i-1])
+            align2.append('-')
             i -= 1
+            k -= w
         else:
-            align1 = '-' + align1
-            align2 = seq2[j-1] + align2
+            align1.append('-')
+            align2.append(seq2[j-1])
             j -= 1
+            k -= 1
+    
+    final_score = score_matrix[n * w + m]
+    return ''.join(reversed(align1)), ''.join(reversed(align2)), int(final_score)
+
+
+def _hirschberg(seq1, seq2, a, b, match_score, mismatch_penalty, gap_penalty):
+    """
+    Hirschberg's divide-and-conquer Needleman-Wunsch in linear space
+    
+    Splits seq1 in half, finds where the optimal path crosses the middle row
+    from a forward and a backward score row, and recurses on both halves.
+    """
+    n, m = len(seq1), len(seq2)
+    if n <= 1 or m <= 1:
+        return _nw_full(seq1, seq2, a, b, match_score, mismatch_penalty, gap_penalty)
+    
+    mid = n // 2
+    upper = _nw_score_row(a[:mid], b, match_score, mismatch_penalty, gap_penalty)
+    lower = _nw_score_row(np.ascontiguousarray(a[mid:][::-1]), np.ascontiguousarray(b[::-1]),
+                          match_score, mismatch_penalty, gap_penalty)
+    totals = upper + lower[::-1]
+    split = int(np.argmax(totals))
+    
+    left1, left2, _ = _hirschberg(seq1[:mid], seq2[:split], a[:mid], b[:split],
+                                  match_score, mismatch_penalty, gap_penalty)
+    right1, right2, _ = _hirschberg(seq1[mid:], seq2[split:], a[mid:], b[split:],
+                                    match_score, mismatch_penalty, gap_penalty)
+    return left1 + right1, left2 + right2, int(totals[split])
+
+
+@functools.lru_cache(maxsize=16)
+def _parasail_matrix(alphabet, match_score, mismatch_penalty):
+    """Parasail substitution matrix over alphabet for the given match/mismatch scores"""
+    return parasail.matrix_create(alphabet, match_score, mismatch_penalty)
+
+
+def _use_parasail(backend, seq1, seq2):
+    """Whether to dispatch to parasail (installed and both sequences non-empty ASCII)"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown alignment backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    return (backend == 'parasail' and parasail is not None and bool(seq1) and bool(seq2)
+            and seq1.isascii() and seq2.isascii())
+
+
+def _parasail_align(align_func, seq1, seq2, match_score, mismatch_penalty, gap_penalty):
+    """Align with a parasail striped traceback function; linear gaps as open == extend"""
+    # One matrix symbol per character present, so each compares equal only to itself
+    alphabet = ''.join(sorted(set(seq1).union(seq2)))
+    result = align_func(seq1, seq2, -gap_penalty, -gap_penalty,
+                        _parasail_matrix(alphabet, match_score, mismatch_penalty))
+    if result.score <= 0 and align_func is parasail.sw_trace_striped_sat:
+        return '', '', 0
+    return result.traceback.query, result.traceback.ref, int(result.score)
+
+
+def _wfa_align(seq1, seq2, a, b, match_score, mismatch_penalty, gap_penalty):
+    """
+    Global alignment with the wavefront algorithm, or None if not applicable
     
-    final_score = score_matrix[n][m]
-    return align1, align2, int(final_score)
+    WFA minimizes a cost with free matches. Since 2*matches + 2*mismatches +
+    gaps = n + m, maximizing the alignment score is the same as minimizing
+    2*(match - mismatch) per mismatch plus (match - 2*gap) per gap column,
+    so the scheme maps onto WFA whenever both costs are positive.
+    """
+    mismatch_cost = 2 * (match_score - mismatch_penalty)
+    gap_cost = match_score - 2 * gap_penalty
+    if WavefrontAligner is None or mismatch_cost <= 0 or gap_cost <= 0:
+        return None
+    if not (seq1.isascii() and seq2.isascii()):  # WFA2-lib compares bytes
+        return None
+    
+    aligner = WavefrontAligner(seq1, distance='affine', match=0,
+                               mismatch=mismatch_cost, gap_opening=0, gap_extension=gap_cost,
+                               span='end-to-end', heuristic=None)
+    aligner.wavefront_align(seq2)
+    if aligner.status != 0:
+        return None
+    
+    # CIGAR ops: M/=/X consume both sequences, I only seq2, D only seq1
+    align1, align2 = [], []
+    i = j = 0
+    score = 0
+    for op, length in aligner.cigartuples:
+        if op == 1:
+            align1.append('-' * length)
+            align2.append(seq2[j:j + length])
+            j += length
+            score += length * gap_penalty
+        elif op == 2:
+            align1.append(seq1[i:i + length])
+            align2.append('-' * length)
+            i += length
+            score += length * gap_penalty
+        else:
+            matches = int(np.count_nonzero(a[i:i + length] == b[j:j + length]))
+            align1.append(seq1[i:i + length])
+            align2.append(seq2[j:j + length])
+            i += length
+            j += length
+            score += matches * match_score + (length - matches) * mismatch_penalty
+    return ''.join(align1), ''.join(align2), score
 
 
-def smith_waterman(seq1, seq2, match_score=2, mismatch_penalty=-1, gap_penalty=-1):
+def needleman_wunsch(seq1, seq2, match_score=1, mismatch_penalty=-1, gap_penalty=-2, low_memory=False,
+                     backend='builtin'):
+    """
+    Needleman-Wunsch algorithm for global sequence alignment
+    
+    Args:
+        seq1: First DNA sequence (str, bytes or Sequence)
+        seq2: Second DNA sequence (str, bytes or Sequence)
+        match_score: Score for matching nucleotides
+        mismatch_penalty: Penalty for mismatching nucleotides
+        gap_penalty: Penalty for gaps
+        low_memory: Use Hirschberg's algorithm (O(n+m) memory, same score;
+            ties between equally good alignments may resolve differently)
+        backend: 'builtin', or 'parasail' to use the parasail library when
+            installed (same score; ties may resolve differently)
+    
+    Sequences longer than WFA_MIN_LENGTH are aligned with the wavefront
+    algorithm when pywfa is installed; its work grows with the edit distance
+    rather than n*m (same score; ties may resolve differently).
+    
+    Returns:
+        tuple: (aligned_seq1, aligned_seq2, score)
+    """
+    seq1, seq2 = as_sequence(seq1), as_sequence(seq2)
+    a, b = seq1.symbols(), seq2.symbols()
+    seq1, seq2 = seq1.text, seq2.text
+    
+    # Identical sequences: the gapless diagonal is the unique best alignment
+    if seq1 == seq2 and mismatch_penalty <= match_score and 2 * gap_penalty < match_score:
+        return seq1, seq2, len(seq1) * match_score
+    
+    if _use_parasail(backend, seq1, seq2):
+        return _parasail_align(parasail.nw_trace_striped_sat, seq1, seq2,
+                               match_score, mismatch_penalty, gap_penalty)
+    
+    if max(len(seq1), len(seq2)) > WFA_MIN_LENGTH:
+        result = _wfa_align(seq1, seq2, a, b, match_score, mismatch_penalty, gap_penalty)
+        if result is not None:
+            return result
+    
+    if low_memory:
+        return _hirschberg(seq1, seq2, a, b, match_score, mismatch_penalty, gap_penalty)
+    return _nw_full(seq1, seq2, a, b, match_score, mismatch_penalty, gap_penalty)
+
+
+def needleman_wunsch_batch(pairs, match_score=1, mismatch_penalty=-1, gap_penalty=-2, traceback=False):
+    """
+    Needleman-Wunsch over many sequence pairs
+    
+    Scores are computed in parallel across pairs when numba is installed.
+    
+    Args:
+        pairs: Iterable of (seq1, seq2) sequence pairs
+        match_score: Score for matching nucleotides
+        mismatch_penalty: Penalty for mismatching nucleotides
+        gap_penalty: Penalty for gaps
+        traceback: Return full alignments instead of scores only
+    
+    Returns:
+        list: Scores, or (aligned_seq1, aligned_seq2, score) tuples with traceback
+    """
+    pairs = [(as_sequence(seq1), as_sequence(seq2)) for seq1, seq2 in pairs]
+    if traceback:
+        return [needleman_wunsch(seq1, seq2, match_score, mismatch_penalty, gap_penalty)
+                for seq1, seq2 in pairs]
+    if not pairs:
+        return []
+    
+    A, La = _pad_rows([seq1 for seq1, _ in pairs])
+    B, Lb = _pad_rows([seq2 for _, seq2 in pairs])
+    scores = np.empty(len(pairs), dtype=np.int64)
+    with parallel_lock:
+        _nw_batch_scores(A, La, B, Lb, match_score, mismatch_penalty, gap_penalty, scores)
+    return scores.tolist()
+
+
+def smith_waterman(seq1, seq2, match_score=2, mismatch_penalty=-1, gap_penalty=-1, backend='builtin'):
     """
     Smith-Waterman algorithm for local sequence alignment
     
     Args:
-        seq1: First DNA sequence
-        seq2: Second DNA sequence
+        seq1: First DNA sequence (str, bytes or Sequence)
+        seq2: Second DNA sequence (str, bytes or Sequence)
         match_score: Score for matching nucleotides
         mismatch_penalty: Penalty for mismatching nucleotides
         gap_penalty: Penalty for gaps
+        backend: 'builtin', or 'parasail' to use the parasail library when
+            installed (same score; ties may resolve differently)
     
     Returns:
         tuple: (aligned_seq1, aligned_seq2, score)
     """
-    seq1 = seq1.upper()
-    seq2 = seq2.upper()
+    seq1, seq2 = as_sequence(seq1), as_sequence(seq2)
+    a, b = seq1.symbols(), seq2.symbols()
+    seq1, seq2 = seq1.text, seq2.text
+    
+    # One sequence inside the other: its first occurrence is the alignment
+    # the full scan would find, scoring a match at every position
+    if match_score > 0 and mismatch_penalty < match_score and gap_penalty < 0:
+        if len(seq2) <= len(seq1):
+            pos = seq1.find(seq2)
+            if pos >= 0:
+                return seq1[pos:pos + len(seq2)], seq2, len(seq2) * match_score
+        else:
+            pos = seq2.find(seq1)
+            if pos >= 0:
+                return seq1, seq2[pos:pos + len(seq1)], len(seq1) * match_score
+    
+    if _use_parasail(backend, seq1, seq2):
+        return _parasail_align(parasail.sw_trace_striped_sat, seq1, seq2,
+                               match_score, mismatch_penalty, gap_penalty)
     
     n, m = len(seq1), len(seq2)
     
-    # Initialize scoring matrix
-    score_matrix = [[0 for _ in range(m + 1)] for _ in range(n + 1)]
-    max_score = 0
-    max_pos = (0, 0)
+    # Initialize flat (n+1) x (m+1) scoring matrix
+    w = m + 1
+    score_matrix = np.zeros((n + 1) * w, dtype=np.int32)
     
     # Fill the scoring matrix
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            match = score_matrix[i-1][j-1] + (match_score if seq1[i-1] == seq2[j-1] else mismatch_penalty)
-            delete = score_matrix[i-1][j] + gap_penalty
-            insert = score_matrix[i][j-1] + gap_penalty
-            score_matrix[i][j] = max(0, match, delete, insert)
-            
-            if score_matrix[i][j] > max_score:
-                max_score = score_matrix[i][j]
-                max_pos = (i, j)
-    
-    # Traceback
-    align1, align2 = '', ''
-    i, j = max_pos
-    
-    while i > 0 and j > 0 and score_matrix[i][j] > 0:
-        current_score = score_matrix[i][j]
+    _sw_fill(a, b, match_score, mismatch_penalty, gap_penalty, score_matrix)
+    
+    # First maximum in row-major order, as in a cell-by-cell scan
+    k = int(np.argmax(score_matrix))
+    max_score = score_matrix[k]
+    
+    # Traceback (built in reverse, joined once at the end)
+    codes1, codes2 = a.tolist(), b.tolist()
+    align1, align2 = [], []
+    i, j = divmod(k, w)
+    
+    while i > 0 and j > 0 and score_matrix[k] > 0:
+        current_score = score_matrix[k]
         
-        if current_score == score_matrix[i-1][j-1] + (match_score if seq1[i-1] == seq2[j-1] else mismatch_penalty):
-            align1 = seq1[i-1] + align1
-            align2 = seq2[j-1] + align2
+        if current_score == score_matrix[k-w-1] + (match_score if codes1[i-1] == codes2[j-1] else mismatch_penalty):
+            align1.append(seq1[i-1])
+            align2.append(seq2[j-1])
             i -= 1
             j -= 1
-        elif current_score == score_matrix[i-1][j] + gap_penalty:
-            align1 = seq1[i-1] + align1
-            align2 = '-' + align2
+            k -= w + 1
+        elif current_score == score_matrix[k-w] + gap_penalty:
+            align1.append(seq1[i-1])
+            align2.append('-')
             i -= 1
+            k -= w
         else:
-            align1 = '-' + align1
-            align2 = seq2[j-1] + align2
+            align1.append('-')
+            align2.append(seq2[j-1])
             j -= 1
+            k -= 1
     
-    return align1, align2, int(max_score)
+    return ''.join(reversed(align1)), ''.join(reversed(align2)), int(max_score)
 
 
 def calculate_alignment_stats(align1, align2):
@@ -3,21 +3,202 @@ CRISPR PAM Site Finder
 Identifies Cas9 PAM (Protospacer Adjacent Motif) sites in DNA sequences
 """
 
+import functools
+import itertools
 import re
 
+import numpy as np
+
+from ._jit import HAVE_NUMBA, njit, parallel_lock, prange
+from ._seq import _RC_TABLE, _RC_TABLE_STR, Sequence, as_sequence
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; regex scanning is used instead
+    ahocorasick = None
+
+_NUCLEOTIDES = frozenset(b'ATGC')
+
+# Sequences at least this long are scanned for PAMs in parallel (needs numba)
+PARALLEL_SCAN_MIN_LENGTH = 1_000_000
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_pam(pam_pattern):
+    """Compile a PAM pattern (N = any nucleotide) to a bytes regex"""
+    return re.compile(pam_pattern.replace('N', '[ATGC]').encode('ascii'))
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_pam_overlapping(pam_pattern):
+    """Like _compile_pam, but matching at every offset (overlaps included)"""
+    return re.compile(b'(?=' + _compile_pam(pam_pattern).pattern + b')')
+
+
+@functools.lru_cache(maxsize=32)
+def _pam_automaton(pam_pattern):
+    """Aho-Corasick automaton over every concrete expansion of an N-containing PAM"""
+    if ahocorasick is None or 'N' not in pam_pattern:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    choices = ['ATGC' if base == 'N' else base for base in pam_pattern]
+    for bases in itertools.product(*choices):
+        pam = ''.join(bases)
+        automaton.add_word(pam, pam.encode('ascii'))
+    automaton.make_automaton()
+    return automaton
+
+
+@functools.lru_cache(maxsize=32)
+def _pam_codes(pam_pattern):
+    """PAM pattern as a uint8 array with N stored as 0 (any nucleotide)"""
+    return np.frombuffer(pam_pattern.replace('N', '\0').encode('ascii'), dtype=np.uint8)
+
+
+@njit(parallel=True, cache=True)
+def _pam_hit_mask(arr, pattern):
+    """Mask of every offset of arr where pattern matches, overlaps included"""
+    n, width = arr.shape[0], pattern.shape[0]
+    hits = np.zeros(max(n - width + 1, 0), dtype=np.bool_)
+    for pos in prange(hits.shape[0]):
+        hit = True
+        for k in range(width):
+            base = arr[pos + k]
+            if pattern[k] == 0:
+                if base != 65 and base != 67 and base != 71 and base != 84:
+                    hit = False
+                    break
+            elif base != pattern[k]:
+                hit = False
+                break
+        hits[pos] = hit
+    return hits
+
+
+def _parallel_scan(seq, pam_pattern):
+    """Whether to find PAM offsets with the parallel numba kernel"""
+    return HAVE_NUMBA and len(seq) >= PARALLEL_SCAN_MIN_LENGTH and pam_pattern.isascii() and pam_pattern.isalpha()
+
+
+def _pam_offsets(seq, pam_pattern):
+    """Every offset where pam_pattern matches seq, overlaps included, in parallel"""
+    with parallel_lock:
+        hits = _pam_hit_mask(np.frombuffer(seq, dtype=np.uint8), _pam_codes(pam_pattern))
+    return np.flatnonzero(hits).tolist()
+
+
+def _iter_pam_matches(seq, pam_pattern, start=0):
+    """
+    Yield (position, pam_bytes) for non-overlapping PAM matches, left to right
+    
+    Matches are the same as a left-to-right regex scan with N = [ATGC]
+    beginning at offset start.
+    """
+    if _parallel_scan(seq, pam_pattern):
+        width = len(pam_pattern)
+        last_end = start
+        for pos in _pam_offsets(seq, pam_pattern):
+            if pos >= last_end:
+                yield pos, seq[pos:pos + width]
+                last_end = pos + width
+        return
+    
+    if pam_pattern == 'NGG':
+        # SpCas9 fast path: find each GG and check the base before it
+        pos = seq.find(b'GG', start + 1)
+        while pos >= 0:
+            if seq[pos - 1] in _NUCLEOTIDES:
+                yield pos - 1, seq[pos - 1:pos + 2]
+                pos = seq.find(b'GG', pos + 3)
+            else:
+                pos = seq.find(b'GG', pos + 1)
+        return
+    
+    automaton = _pam_automaton(pam_pattern)
+    if automaton is not None:
+        # All expansions share one length, so matches arrive ordered by start
+        last_end = start
+        for end, pam in automaton.iter(seq.decode('ascii'), start):
+            pos = end - len(pam) + 1
+            if pos >= last_end:
+                yield pos, pam
+                last_end = end + 1
+        return
+    
+    for match in _compile_pam(pam_pattern).finditer(seq, start):
+        yield match.start(), match.group()
+
+
+def _reverse_pam_matches(seq, pam_pattern, end=None):
+    """
+    Yield (position, pam_bytes) for reverse-strand PAMs without building the
+    reverse complement of seq
+    
+    The reverse-complemented pattern is matched at every offset on the forward
+    strand, then non-overlapping matches ending by `end` are kept from the
+    right; this is the same set a left-to-right scan of the reverse complement
+    would find starting len(seq) - end bases in. Positions are forward-strand
+    starts and pam_bytes is the PAM as read on the reverse strand.
+    """
+    rc_pattern = pam_pattern.translate(_RC_TABLE_STR)[::-1]
+    width = len(rc_pattern)
+    
+    automaton = _pam_automaton(rc_pattern)
+    if _parallel_scan(seq, rc_pattern):
+        positions = _pam_offsets(seq, rc_pattern)
+    elif automaton is not None:
+        positions = [end - width + 1 for end, _ in automaton.iter(seq.decode('ascii'))]
+    else:
+        positions = [match.start() for match in _compile_pam_overlapping(rc_pattern).finditer(seq)]
+    
+    limit = len(seq) if end is None else end
+    for pos in reversed(positions):
+        if pos + width <= limit:
+            yield pos, seq[pos:pos + width].translate(_RC_TABLE)[::-1]
+            limit = pos
+
 
 def reverse_complement(seq):
-    """Get reverse complement of DNA sequence"""
-    complement = {'A': 'T', 'T': 'A', 'G': 'C', 'C': 'G'}
-    return ''.join(complement.get(base, base) for base in reversed(seq))
+    """Get reverse complement of DNA sequence (str or bytes; case is preserved)"""
+    if isinstance(seq, str):
+        return seq.translate(_RC_TABLE_STR)[::-1]
+    return seq.translate(_RC_TABLE)[::-1]
 
 
-def calculate_gc_content(seq):
-    """Calculate GC content percentage"""
-    if len(seq) == 0:
+def _gc_percent(gc_count, length):
+    """GC percentage from a G+C count"""
+    if length == 0:
         return 0
-    gc_count = seq.count('G') + seq.count('C')
-    return round((gc_count / len(seq)) * 100, 2)
+    return round((gc_count / length) * 100, 2)
+
+
+def _prefix_sums(mask):
+    """List p where p[e] - p[s] is the number of True entries in mask[s:e]"""
+    return [0] + np.cumsum(mask).tolist()
+
+
+def _run_starts(arr, base, run):
+    """Mask of positions where `run` copies of base begin"""
+    n = max(arr.size - run + 1, 0)
+    hit = np.ones(n, dtype=bool)
+    for k in range(run):
+        hit &= arr[k:k + n] == base
+    return hit
+
+
+def _window_has_run(run_prefix, start, end, run):
+    """True if a run counted in run_prefix fits entirely inside [start, end)"""
+    return end - start >= run and run_prefix[end - run + 1] > run_prefix[start]
+
+
+def calculate_gc_content(seq):
+    """Calculate GC content percentage (seq may be str, bytes or Sequence)"""
+    if isinstance(seq, Sequence):
+        seq = seq.raw
+    if isinstance(seq, bytes):
+        return _gc_percent(seq.count(b'G') + seq.count(b'C'), len(seq))
+    return _gc_percent(seq.count('G') + seq.count('C'), len(seq))
 
 
 def evaluate_target_efficiency(guide_rna):
@@ -33,6 +214,11 @@ def evaluate_target_efficiency(guide_rna):
     # Check for poly-T stretch (avoid)
     has_poly_t = 'TTTT' in guide_rna
     
+    return _efficiency_class(gc_content, has_poly_t)
+
+
+def _efficiency_class(gc_content, has_poly_t):
+    """Efficiency grade from a guide's GC content and poly-T flag"""
     # Optimal GC content is 40-60%
     if 40 <= gc_content <= 60 and not has_poly_t:
         return 'High'
@@ -47,71 +233,83 @@ def find_pam_sites(sequence, pam_pattern='NGG', guide_length=20):
     Find PAM sites in DNA sequence
     
     Args:
-        sequence: DNA sequence to search
+        sequence: DNA sequence to search (str, bytes or Sequence)
         pam_pattern: PAM pattern (default: NGG for SpCas9)
         guide_length: Length of guide RNA (default: 20)
     
     Returns:
         dict: PAM sites analysis results
     """
-    sequence = sequence.upper()
+    sequence = as_sequence(sequence)
+    seq = sequence.raw
+    guide_length = max(0, guide_length)
     sites = []
     
-    # Convert PAM pattern to regex (N = any nucleotide)
-    pam_regex = pam_pattern.replace('N', '[ATGC]')
+    # Guide features for any window in O(1) from whole-sequence prefix sums.
+    # Complementing keeps G/C as G/C, and a TTTT on the reverse strand is an
+    # AAAA on the forward strand.
+    arr = sequence.array()
+    seq_len = len(seq)
+    gc_prefix = sequence.gc_prefix()
+    poly_t_prefix = _prefix_sums(_run_starts(arr, ord('T'), 4))
+    poly_a_prefix = _prefix_sums(_run_starts(arr, ord('A'), 4))
     
-    # Find PAM sites on forward strand
-    for match in re.finditer(pam_regex, sequence):
-        pam_pos = match.start()
-        pam_seq = match.group()
-        
+    # Find PAM sites on forward strand, starting where a full guide fits
+    for pam_pos, pam_seq in _iter_pam_matches(seq, pam_pattern, guide_length):
         # Extract guide RNA sequence (20 bp upstream of PAM)
-        guide_start = max(0, pam_pos - guide_length)
-        guide_rna = sequence[guide_start:pam_pos] if pam_pos >= guide_length else None
+        guide_start = pam_pos - guide_length
+        guide_rna = seq[guide_start:pam_pos].decode()
         
         # Get context (10 bp on each side)
         context_start = max(0, pam_pos - 10)
-        context_end = min(len(sequence), pam_pos + len(pam_seq) + 10)
-        context = sequence[context_start:context_end]
+        context_end = min(len(seq), pam_pos + len(pam_seq) + 10)
+        context = seq[context_start:context_end].decode()
         
-        efficiency = evaluate_target_efficiency(guide_rna) if guide_rna else 'Low'
+        if guide_rna:
+            gc_content = _gc_percent(gc_prefix[pam_pos] - gc_prefix[guide_start], len(guide_rna))
+            has_poly_t = _window_has_run(poly_t_prefix, guide_start, pam_pos, 4)
+            efficiency = _efficiency_class(gc_content, has_poly_t)
+        else:
+            efficiency = 'Low'
         
         sites.append({
             'position': pam_pos + 1,  # 1-indexed
-            'pam_sequence': pam_seq,
+            'pam_sequence': pam_seq.decode(),
             'strand': 'forward',
             'guide_rna': guide_rna,
-            'guide_length': len(guide_rna) if guide_rna else 0,
+            'guide_length': len(guide_rna),
             'target_efficiency': efficiency,
             'context': context
         })
     
-    # Find PAM sites on reverse strand
-    rev_comp = reverse_complement(sequence)
-    for match in re.finditer(pam_regex, rev_comp):
-        pam_pos = match.start()
-        pam_seq = match.group()
-        
-        # Calculate position in original sequence
-        original_pos = len(sequence) - pam_pos - len(pam_seq)
+    # Find PAM sites on reverse strand, leaving room for a full guide after
+    # each; reverse-strand slices are taken from the forward sequence and
+    # reverse-complemented, guide and context only
+    for pam_pos, pam_seq in _reverse_pam_matches(seq, pam_pattern, seq_len - guide_length):
+        pam_end = pam_pos + len(pam_seq)
         
-        # Extract guide RNA sequence
-        guide_start = max(0, pam_pos - guide_length)
-        guide_rna = rev_comp[guide_start:pam_pos] if pam_pos >= guide_length else None
+        # Extract guide RNA sequence (downstream on the forward strand)
+        guide_end = pam_end + guide_length
+        guide_rna = seq[pam_end:guide_end].translate(_RC_TABLE)[::-1].decode()
         
         # Get context
         context_start = max(0, pam_pos - 10)
-        context_end = min(len(rev_comp), pam_pos + len(pam_seq) + 10)
-        context = rev_comp[context_start:context_end]
+        context_end = min(seq_len, pam_end + 10)
+        context = seq[context_start:context_end].translate(_RC_TABLE)[::-1].decode()
         
-        efficiency = evaluate_target_efficiency(guide_rna) if guide_rna else 'Low'
+        if guide_rna:
+            gc_content = _gc_percent(gc_prefix[guide_end] - gc_prefix[pam_end], len(guide_rna))
+            has_poly_t = _window_has_run(poly_a_prefix, pam_end, guide_end, 4)
+            efficiency = _efficiency_class(gc_content, has_poly_t)
+        else:
+            efficiency = 'Low'
         
         sites.append({
-            'position': original_pos + 1,  # 1-indexed
-            'pam_sequence': pam_seq,
+            'position': pam_pos + 1,  # 1-indexed
+            'pam_sequence': pam_seq.decode(),
             'strand': 'reverse',
             'guide_rna': guide_rna,
-            'guide_length': len(guide_rna) if guide_rna else 0,
+            'guide_length': len(guide_rna),
             'target_efficiency': efficiency,
             'context': context
         })
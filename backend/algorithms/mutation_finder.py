@@ -3,27 +3,64 @@ Mutation and SNP Finder
 Identifies single nucleotide polymorphisms and other mutations between sequences
 """
 
+import numpy as np
+
+from ._seq import as_sequence
+
+CODON_TABLE = {
+    'TTT': 'F', 'TTC': 'F', 'TTA': 'L', 'TTG': 'L',
+    'CTT': 'L', 'CTC': 'L', 'CTA': 'L', 'CTG': 'L',
+    'ATT': 'I', 'ATC': 'I', 'ATA': 'I', 'ATG': 'M',
+    'GTT': 'V', 'GTC': 'V', 'GTA': 'V', 'GTG': 'V',
+    'TCT': 'S', 'TCC': 'S', 'TCA': 'S', 'TCG': 'S',
+    'CCT': 'P', 'CCC': 'P', 'CCA': 'P', 'CCG': 'P',
+    'ACT': 'T', 'ACC': 'T', 'ACA': 'T', 'ACG': 'T',
+    'GCT': 'A', 'GCC': 'A', 'GCA': 'A', 'GCG': 'A',
+    'TAT': 'Y', 'TAC': 'Y', 'TAA': '*', 'TAG': '*',
+    'CAT': 'H', 'CAC': 'H', 'CAA': 'Q', 'CAG': 'Q',
+    'AAT': 'N', 'AAC': 'N', 'AAA': 'K', 'AAG': 'K',
+    'GAT': 'D', 'GAC': 'D', 'GAA': 'E', 'GAG': 'E',
+    'TGT': 'C', 'TGC': 'C', 'TGA': '*', 'TGG': 'W',
+    'CGT': 'R', 'CGC': 'R', 'CGA': 'R', 'CGG': 'R',
+    'AGT': 'S', 'AGC': 'S', 'AGA': 'R', 'AGG': 'R',
+    'GGT': 'G', 'GGC': 'G', 'GGA': 'G', 'GGG': 'G'
+}
+
+# Nucleotide codes by byte value (A=0, C=1, G=2, T=3, anything else=255)
+_NT = bytearray(b'\xff' * 256)
+for _code, _base in enumerate('ACGT'):
+    _NT[ord(_base)] = _NT[ord(_base.lower())] = _code
+_NT = bytes(_NT)
+
+# Amino acid for each codon packed as (b0 << 4) | (b1 << 2) | b2
+_AA_TABLE = bytes(
+    ord(CODON_TABLE[b0 + b1 + b2])
+    for b0 in 'ACGT' for b1 in 'ACGT' for b2 in 'ACGT'
+)
+
+# The same tables as numpy arrays for vectorized lookups
+_NT_CODES = np.frombuffer(_NT, dtype=np.uint8)
+_AA_CODES = np.frombuffer(_AA_TABLE, dtype=np.uint8)
+
+_GAP = ord('-')
+
+# Mutation type and class codes produced by _scan
+_SNP, _INSERTION, _DELETION = 0, 1, 2
+_UNKNOWN, _SILENT, _MISSENSE, _NONSENSE = 0, 1, 2, 3
+_CLASS_NAMES = ('Unknown', 'Silent', 'Missense', 'Nonsense')
+
+
 def translate_codon(codon):
     """Translate a DNA codon to amino acid"""
-    codon_table = {
-        'TTT': 'F', 'TTC': 'F', 'TTA': 'L', 'TTG': 'L',
-        'CTT': 'L', 'CTC': 'L', 'CTA': 'L', 'CTG': 'L',
-        'ATT': 'I', 'ATC': 'I', 'ATA': 'I', 'ATG': 'M',
-        'GTT': 'V', 'GTC': 'V', 'GTA': 'V', 'GTG': 'V',
-        'TCT': 'S', 'TCC': 'S', 'TCA': 'S', 'TCG': 'S',
-        'CCT': 'P', 'CCC': 'P', 'CCA': 'P', 'CCG': 'P',
-        'ACT': 'T', 'ACC': 'T', 'ACA': 'T', 'ACG': 'T',
-        'GCT': 'A', 'GCC': 'A', 'GCA': 'A', 'GCG': 'A',
-        'TAT': 'Y', 'TAC': 'Y', 'TAA': '*', 'TAG': '*',
-        'CAT': 'H', 'CAC': 'H', 'CAA': 'Q', 'CAG': 'Q',
-        'AAT': 'N', 'AAC': 'N', 'AAA': 'K', 'AAG': 'K',
-        'GAT': 'D', 'GAC': 'D', 'GAA': 'E', 'GAG': 'E',
-        'TGT': 'C', 'TGC': 'C', 'TGA': '*', 'TGG': 'W',
-        'CGT': 'R', 'CGC': 'R', 'CGA': 'R', 'CGG': 'R',
-        'AGT': 'S', 'AGC': 'S', 'AGA': 'R', 'AGG': 'R',
-        'GGT': 'G', 'GGC': 'G', 'GGA': 'G', 'GGG': 'G'
-    }
-    return codon_table.get(codon.upper(), 'X')
+    if len(codon) != 3:
+        return 'X'
+    try:
+        n0, n1, n2 = _NT[ord(codon[0])], _NT[ord(codon[1])], _NT[ord(codon[2])]
+    except IndexError:
+        return 'X'
+    if (n0 | n1 | n2) > 3:
+        return 'X'
+    return chr(_AA_TABLE[(n0 << 4) | (n1 << 2) | n2])
 
 
 def classify_mutation(ref_codon, alt_codon):
@@ -42,99 +79,145 @@ def classify_mutation(ref_codon, alt_codon):
         return 'Missense'
 
 
+def _codon_aas(codons):
+    """Amino acid bytes for a (k, 3) array of codon bytes ('X' if not A/C/G/T)"""
+    nt = _NT_CODES[codons].astype(np.uint16)
+    packed = (nt[:, 0] << 4) | (nt[:, 1] << 2) | nt[:, 2]
+    invalid = (nt > 3).any(axis=1)
+    return np.where(invalid, ord('X'), _AA_CODES[packed & 63])
+
+
+def _classify_snps(a, b, positions):
+    """Codon class of each SNP position (Unknown if its codon has a gap)"""
+    classes = np.full(positions.size, _UNKNOWN, dtype=np.uint8)
+    
+    # Only whole codons can be classified
+    n_codons = a.size // 3
+    codon_idx = positions // 3
+    complete = codon_idx < n_codons
+    ref = a[:3 * n_codons].reshape(-1, 3)[codon_idx[complete]]
+    alt = b[:3 * n_codons].reshape(-1, 3)[codon_idx[complete]]
+    
+    gap_free = ~((ref == _GAP) | (alt == _GAP)).any(axis=1)
+    ref_aa = _codon_aas(ref[gap_free])
+    alt_aa = _codon_aas(alt[gap_free])
+    
+    codon_classes = np.where(ref_aa == alt_aa, _SILENT, np.where(alt_aa == ord('*'), _NONSENSE, _MISSENSE))
+    classified = np.flatnonzero(complete)[gap_free]
+    classes[classified] = codon_classes
+    return classes
+
+
+def _gap_runs(gap_mask, opposite_base):
+    """
+    Indels from one sequence's gaps, as (starts, ends) index arrays
+    
+    Each maximal run of gap_mask is one indel ending where the run ends. It
+    starts at the run's first position where the other sequence has a base;
+    gap-gap columns before that are not differences.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], gap_mask.view(np.int8), [0]))))
+    run_starts, run_ends = edges[::2], edges[1::2]
+    
+    candidates = np.flatnonzero(gap_mask & opposite_base)
+    runs = np.searchsorted(run_starts, candidates, side='right') - 1
+    runs, first = np.unique(runs, return_index=True)
+    return candidates[first], run_ends[runs]
+
+
+def _scan(a, b):
+    """
+    Find mutations between two equal-length gap-padded byte arrays
+    
+    Returns:
+        tuple: (types, starts, ends, classes) arrays ordered by position
+    """
+    a_gap, b_gap = a == _GAP, b == _GAP
+    
+    snp_pos = np.flatnonzero((a != b) & ~a_gap & ~b_gap)
+    ins_starts, ins_ends = _gap_runs(a_gap, ~b_gap)
+    del_starts, del_ends = _gap_runs(b_gap, ~a_gap)
+    
+    types = np.concatenate((
+        np.full(snp_pos.size, _SNP, dtype=np.uint8),
+        np.full(ins_starts.size, _INSERTION, dtype=np.uint8),
+        np.full(del_starts.size, _DELETION, dtype=np.uint8),
+    ))
+    starts = np.concatenate((snp_pos, ins_starts, del_starts))
+    ends = np.concatenate((snp_pos + 1, ins_ends, del_ends))
+    classes = np.concatenate((
+        _classify_snps(a, b, snp_pos),
+        np.zeros(ins_starts.size + del_starts.size, dtype=np.uint8),
+    ))
+    
+    order = np.argsort(starts, kind='stable')
+    return types[order], starts[order], ends[order], classes[order]
+
+
+def _padded_slice(seq, start, end):
+    """seq[start:end] as if seq were padded with '-' past its end"""
+    return seq[start:end] + '-' * max(0, end - max(start, len(seq)))
+
+
+def _mutation_record(kind, start, end, cls, seq1, seq2):
+    """Build the result dict for one mutation found by _scan"""
+    if kind == _SNP:
+        return {
+            'position': start + 1,
+            'type': 'SNP',
+            'reference': seq1[start],
+            'alternate': seq2[start],
+            'mutation_class': _CLASS_NAMES[cls]
+        }
+    if kind == _INSERTION:
+        return {
+            'position': start + 1,
+            'type': 'Insertion',
+            'inserted_sequence': _padded_slice(seq2, start, end),
+            'mutation_class': 'Frameshift'
+        }
+    return {
+        'position': start + 1,
+        'type': 'Deletion',
+        'deleted_sequence': _padded_slice(seq1, start, end),
+        'mutation_class': 'Frameshift'
+    }
+
+
 def find_mutations(seq1, seq2):
     """
     Find mutations between two DNA sequences
     
     Args:
-        seq1: Reference DNA sequence
-        seq2: Alternate DNA sequence
+        seq1: Reference DNA sequence (str, bytes or Sequence)
+        seq2: Alternate DNA sequence (str, bytes or Sequence)
     
     Returns:
         dict: Mutation analysis results
     """
-    seq1 = seq1.upper()
-    seq2 = seq2.upper()
-    
-    mutations = []
-    snps = 0
-    insertions = 0
-    deletions = 0
-    silent = 0
-    missense = 0
-    nonsense = 0
-    
-    # Handle different length sequences
-    max_len = max(len(seq1), len(seq2))
-    seq1_padded = seq1 + '-' * (max_len - len(seq1))
-    seq2_padded = seq2 + '-' * (max_len - len(seq2))
-    
-    i = 0
-    while i < max_len:
-        if seq1_padded[i] != seq2_padded[i]:
-            # Check for SNP (single nucleotide polymorphism)
-            if seq1_padded[i] != '-' and seq2_padded[i] != '-':
-                # Get codon context if possible
-                codon_pos = (i // 3) * 3
-                if codon_pos + 2 < max_len:
-                    ref_codon = seq1_padded[codon_pos:codon_pos+3]
-                    alt_codon = seq2_padded[codon_pos:codon_pos+3]
-                    
-                    if '-' not in ref_codon and '-' not in alt_codon:
-                        classification = classify_mutation(ref_codon, alt_codon)
-                        
-                        if classification == 'Silent':
-                            silent += 1
-                        elif classification == 'Missense':
-                            missense += 1
-                        elif classification == 'Nonsense':
-                            nonsense += 1
-                    else:
-                        classification = 'Unknown'
-                else:
-                    classification = 'Unknown'
-                
-                mutations.append({
-                    'position': i + 1,
-                    'type': 'SNP',
-                    'reference': seq1_padded[i],
-                    'alternate': seq2_padded[i],
-                    'mutation_class': classification
-                })
-                snps += 1
-                i += 1
-            
-            # Check for insertion
-            elif seq1_padded[i] == '-':
-                insert_end = i
-                while insert_end < max_len and seq1_padded[insert_end] == '-':
-                    insert_end += 1
-                
-                mutations.append({
-                    'position': i + 1,
-                    'type': 'Insertion',
-                    'inserted_sequence': seq2_padded[i:insert_end],
-                    'mutation_class': 'Frameshift'
-                })
-                insertions += 1
-                i = insert_end
-            
-            # Check for deletion
-            elif seq2_padded[i] == '-':
-                delete_end = i
-                while delete_end < max_len and seq2_padded[delete_end] == '-':
-                    delete_end += 1
-                
-                mutations.append({
-                    'position': i + 1,
-                    'type': 'Deletion',
-                    'deleted_sequence': seq1_padded[i:delete_end],
-                    'mutation_class': 'Frameshift'
-                })
-                deletions += 1
-                i = delete_end
-        else:
-            i += 1
+    seq1, seq2 = as_sequence(seq1), as_sequence(seq2)
+    a, b = seq1.array(), seq2.array()
+    seq1, seq2 = seq1.text, seq2.text
+    
+    # Handle different length sequences by gap-padding only the shorter one
+    if a.size < b.size:
+        a = np.pad(a, (0, b.size - a.size), constant_values=_GAP)
+    elif b.size < a.size:
+        b = np.pad(b, (0, a.size - b.size), constant_values=_GAP)
+    
+    types, starts, ends, classes = _scan(a, b)
+    
+    mutations = [
+        _mutation_record(kind, start, end, cls, seq1, seq2)
+        for kind, start, end, cls in zip(types.tolist(), starts.tolist(), ends.tolist(), classes.tolist())
+    ]
+    
+    snps = int(np.count_nonzero(types == _SNP))
+    insertions = int(np.count_nonzero(types == _INSERTION))
+    deletions = int(np.count_nonzero(types == _DELETION))
+    silent = int(np.count_nonzero(classes == _SILENT))
+    missense = int(np.count_nonzero(classes == _MISSENSE))
+    nonsense = int(np.count_nonzero(classes == _NONSENSE))
     
     return {
         'summary': {
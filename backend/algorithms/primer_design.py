@@ -3,7 +3,18 @@ Enhanced PCR Primer Designer with Advanced Analysis
 Includes nearest-neighbor Tm, hairpin detection, dimer analysis, and protocol suggestions
 """
 
+import functools
+import logging
 import math
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+from ._jit import HAVE_NUMBA, njit
+from ._seq import _LUT, _RC_TABLE, _RC_TABLE_STR, as_sequence
+
+logger = logging.getLogger(__name__)
 
 # Nearest-neighbor thermodynamic parameters (SantaLucia 1998)
 NN_PARAMS = {
@@ -25,13 +36,69 @@ NN_PARAMS = {
     'CC': {'dH': -8.0, 'dS': -19.9}
 }
 
+# Runs of three or more of one nucleotide, found in a single scan
+_POLY_RE = re.compile(r'(A{3,}|T{3,}|G{3,}|C{3,})')
+
+# NN_PARAMS as a (25, 2) [dH, dS] table indexed by 5 * code(first) + code(second)
+# with the _LUT nucleotide codes; steps involving a non-ACGT base stay zero
+_NN_FIRST = _LUT.astype(np.intp) * 5
+_NN_SECOND = _LUT.astype(np.intp)
+_NN_TABLE = np.zeros((25, 2))
+for _dinuc, _params in NN_PARAMS.items():
+    _NN_TABLE[_NN_FIRST[ord(_dinuc[0])] + _NN_SECOND[ord(_dinuc[1])]] = _params['dH'], _params['dS']
+
+# Complement of every byte value, for kernels that reverse-complement in place
+_COMP_CODES = np.frombuffer(bytes(range(256)).translate(_RC_TABLE), dtype=np.uint8)
 
+# One row per primer window in design_primers; dicts are only built for the top 5
+CAND_DTYPE = np.dtype([
+    ('position', np.intp),
+    ('tm', np.float64),
+    ('gc', np.float64),
+    ('score', np.int64),
+    ('tm_gap', np.float64),
+])
+
+
+@functools.lru_cache(maxsize=4096)
 def reverse_complement(seq):
     """Get reverse complement of DNA sequence"""
-    complement = {'A': 'T', 'T': 'A', 'G': 'C', 'C': 'G'}
-    return ''.join(complement.get(base, base) for base in reversed(seq))
+    return seq.translate(_RC_TABLE_STR)[::-1]
+
+
+# make_tm_fn instances keyed by (length, primer_conc, salt_conc)
+_TM_FNS = {}
 
 
+def make_tm_fn(length, primer_conc=0.5, salt_conc=50):
+    """
+    Nearest-neighbor Tm function specialized for length-base primers
+    
+    The salt correction and primer concentration terms are computed once per
+    (length, primer_conc, salt_conc) and the function is cached.
+    
+    Returns:
+        callable: tm(dH, dS) from the summed dinucleotide dH and dS (floats
+        or arrays), unrounded
+    """
+    key = (length, primer_conc, salt_conc)
+    tm_fn = _TM_FNS.get(key)
+    if tm_fn is None:
+        salt_term = 0.368 * (length - 1) * math.log(salt_conc / 1000)
+        R = 1.987  # Gas constant (cal/mol·K)
+        conc_term = R * math.log(primer_conc * 1e-6 / 4)
+        
+        def tm_fn(dH, dS):
+            # Terminal initiation values, then the salt correction
+            dH = dH + 0.2
+            dS = dS + -5.7 + salt_term
+            return (1000 * dH) / (dS + conc_term) - 273.15
+        
+        _TM_FNS[key] = tm_fn
+    return tm_fn
+
+
+@functools.lru_cache(maxsize=4096)
 def calculate_tm_nearest_neighbor(seq, primer_conc=0.5, salt_conc=50):
     """
     Calculate Tm using nearest-neighbor thermodynamics (more accurate)
@@ -52,78 +119,183 @@ def calculate_tm_nearest_neighbor(seq, primer_conc=0.5, salt_conc=50):
         g_c = seq.count('G') + seq.count('C')
         return 2 * a_t + 4 * g_c
     
-    # Sum nearest-neighbor contributions
-    dH = 0  # Enthalpy (kcal/mol)
-    dS = 0  # Entropy (cal/mol·K)
-    
-    # Initial values for terminal base pairs
-    dH += 0.2  # Initiation
-    dS += -5.7
+    # Sum all dinucleotide steps with one table gather
+    arr = np.frombuffer(seq.encode('ascii', 'replace'), dtype=np.uint8)
+    dH, dS = _NN_TABLE[_NN_FIRST[arr[:-1]] + _NN_SECOND[arr[1:]]].sum(axis=0).tolist()
     
-    # Sum all dinucleotide steps
-    for i in range(len(seq) - 1):
-        dinuc = seq[i:i+2]
-        if dinuc in NN_PARAMS:
-            dH += NN_PARAMS[dinuc]['dH']
-            dS += NN_PARAMS[dinuc]['dS']
-    
-    # Salt correction
-    dS += 0.368 * (len(seq) - 1) * math.log(salt_conc / 1000)
-    
-    # Tm calculation
-    R = 1.987  # Gas constant (cal/mol·K)
-    primer_conc_M = primer_conc * 1e-6
-    
-    tm = (1000 * dH) / (dS + R * math.log(primer_conc_M / 4)) - 273.15
-    
-    return round(tm, 1)
+    return round(make_tm_fn(len(seq), primer_conc, salt_conc)(dH, dS), 1)
+
+
+def _gc_percent(gc_count, length):
+    """GC percentage from a G+C count"""
+    if length == 0:
+        return 0
+    return round((gc_count / length) * 100, 1)
 
 
 def calculate_gc_content(seq):
     """Calculate GC content percentage"""
-    if len(seq) == 0:
-        return 0
-    gc_count = seq.count('G') + seq.count('C')
-    return round((gc_count / len(seq)) * 100, 1)
+    return _gc_percent(seq.count('G') + seq.count('C'), len(seq))
 
 
-def check_hairpin(seq, threshold=-3.0):
+class PrimerScan(NamedTuple):
+    """Base composition checks shared by check_gc_clamp and evaluate_primer_quality"""
+    gc_count: int
+    gc_in_last_5: int
+    poly_runs: tuple  # Longest run of A, T, G and C, or 0 when shorter than 3
+
+
+@functools.lru_cache(maxsize=4096)
+def primer_scan(seq):
     """
-    Check for hairpin formation potential
+    Scan an uppercase primer once for its GC counts and poly-X runs
     
     Returns:
-        dict: Hairpin analysis with max_stem_length and estimated_dG
+        PrimerScan: Counts reused by each check of the same primer
+    """
+    longest_run = dict.fromkeys('ATGC', 0)
+    for match in _POLY_RE.finditer(seq):
+        run = match.group(1)
+        longest_run[run[0]] = max(longest_run[run[0]], len(run))
+    last_5 = seq[-5:]
+    return PrimerScan(
+        gc_count=seq.count('G') + seq.count('C'),
+        gc_in_last_5=last_5.count('G') + last_5.count('C'),
+        poly_runs=tuple(longest_run.values())
+    )
+
+
+@njit(cache=True)
+def _max_diag_run(M, row_limit, col_limit):
+    """
+    Longest diagonal run of True in match matrix M that starts at (i, j) with
+    i < row_limit and j < col_limit; runs are measured from their start
+    toward the bottom right (the longest common substring DP, run backwards)
+    """
+    n, m = M.shape
+    best = 0
+    prev = np.zeros(m + 1, dtype=np.int64)
+    cur = np.zeros(m + 1, dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        for j in range(m - 1, -1, -1):
+            cur[j] = prev[j + 1] + 1 if M[i, j] else 0
+            if i < row_limit and j < col_limit and cur[j] > best:
+                best = cur[j]
+        prev, cur = cur, prev
+    return best
+
+
+_EVEN_BITS = np.uint64(0x5555555555555555)
+
+
+@njit(cache=True)
+def _pack2bit(seq):
+    """
+    Pack an uppercase ACGT byte array of up to 32 bases into one uint64,
+    base k in bits 2k..2k+1 (A=00, C=01, G=10, T=11)
+    
+    Returns:
+        tuple: (word, ok); ok is False for longer or non-ACGT input
+    """
+    word = np.uint64(0)
+    if seq.shape[0] > 32:
+        return word, False
+    for k in range(seq.shape[0]):
+        code = _LUT[seq[k]]
+        if code > 3 or seq[k] >= 97:
+            return word, False
+        word |= np.uint64(code) << np.uint64(2 * k)
+    return word, True
+
+
+@njit(cache=True)
+def _max_diag_run_packed(a, b, len_a, len_b, row_limit, col_limit):
+    """
+    _max_diag_run for 2-bit packed words a and b of len_a and len_b bases
+    
+    Each diagonal is compared 32 bases at a time: XOR the shifted words, OR
+    each bit pair to mark mismatches, then AND the match mask with itself
+    shifted one base until no allowed run start is left.
+    """
+    one = np.uint64(1)
+    two = np.uint64(2)
+    best = 0
+    for d in range(1 - len_a, len_b):
+        if d >= 0:
+            x = a ^ (b >> np.uint64(2 * d))
+            n = min(len_a, len_b - d)
+            starts = min(n, row_limit, col_limit - d)
+        else:
+            x = (a >> np.uint64(-2 * d)) ^ b
+            n = min(len_b, len_a + d)
+            starts = min(n, col_limit, row_limit + d)
+        if starts <= 0 or n <= best:
+            continue
+        match = ~(x | (x >> one)) & (_EVEN_BITS >> np.uint64(64 - 2 * n))
+        start_mask = _EVEN_BITS >> np.uint64(64 - 2 * starts)
+        run = 0
+        while match & start_mask != np.uint64(0):
+            run += 1
+            match &= match >> two
+        best = max(best, run)
+    return best
+
+
+@njit(cache=True)
+def _match_run(a, b, row_limit, col_limit):
+    """
+    _max_diag_run of a[:, None] == b[None, :] for uint8 byte arrays a and b
+    
+    Primer-length ACGT inputs take the 2-bit packed path.
     """
+    packed_a, ok_a = _pack2bit(a)
+    packed_b, ok_b = _pack2bit(b)
+    if ok_a and ok_b:
+        return _max_diag_run_packed(packed_a, packed_b, a.shape[0], b.shape[0], row_limit, col_limit)
+    M = np.empty((a.shape[0], b.shape[0]), dtype=np.bool_)
+    for i in range(a.shape[0]):
+        for j in range(b.shape[0]):
+            M[i, j] = a[i] == b[j]
+    return _max_diag_run(M, row_limit, col_limit)
+
+
+# Compile (or load from cache) once at import rather than on the first primer
+_match_run(np.zeros(20, dtype=np.uint8), np.zeros(20, dtype=np.uint8), 17, 17)
+
+
+@functools.lru_cache(maxsize=4096)
+def _hairpin_analysis(seq, threshold):
+    """Cached check_hairpin result as a (has_hairpin, max_stem, estimated_dG, risk_level) tuple"""
     seq = seq.upper()
     rev_comp = reverse_complement(seq)
     
-    max_stem = 0
-    best_position = -1
-    
-    # Check for complementary regions
-    for i in range(len(seq) - 3):
-        for j in range(len(seq) - 3):
-            stem_length = 0
-            k = 0
-            while (i + k < len(seq) and j + k < len(seq) and 
-                   seq[i + k] == rev_comp[j + k]):
-                stem_length += 1
-                k += 1
-            
-            if stem_length > max_stem:
-                max_stem = stem_length
-                best_position = i
+    # Complementary regions are diagonal runs in the seq x rev_comp match matrix
+    a = np.frombuffer(seq.encode('ascii', 'replace'), dtype=np.uint8)
+    b = np.frombuffer(rev_comp.encode('ascii', 'replace'), dtype=np.uint8)
+    max_stem = int(_match_run(a, b, len(seq) - 3, len(seq) - 3))
     
     # Estimate free energy (rough approximation)
     estimated_dG = -1.5 * max_stem if max_stem >= 4 else 0
     
     has_hairpin = estimated_dG < threshold
+    risk_level = 'high' if estimated_dG < -5 else ('medium' if estimated_dG < -3 else 'low')
+    
+    return has_hairpin, max_stem, round(estimated_dG, 1), risk_level
+
+
+def check_hairpin(seq, threshold=-3.0):
+    """
+    Check for hairpin formation potential
     
+    Returns:
+        dict: Hairpin analysis with max_stem_length and estimated_dG
+    """
+    has_hairpin, max_stem, estimated_dG, risk_level = _hairpin_analysis(seq, threshold)
     return {
         'has_hairpin': has_hairpin,
         'max_stem_length': max_stem,
-        'estimated_dG': round(estimated_dG, 1),
-        'risk_level': 'high' if estimated_dG < -5 else ('medium' if estimated_dG < -3 else 'low')
+        'estimated_dG': estimated_dG,
+        'risk_level': risk_level
     }
 
 
@@ -150,17 +322,10 @@ def check_primer_dimers(fwd_seq, rev_seq, threshold=-5.0):
         if fwd_3_end[i] == complement.get(rev_3_end[end_length-1-i], ''):
             complementarity += 1
     
-    # Check overall complementarity
-    max_complement = 0
-    for i in range(len(fwd) - 3):
-        for j in range(len(rev_comp_rev) - 3):
-            count = 0
-            k = 0
-            while (i + k < len(fwd) and j + k < len(rev_comp_rev) and
-                   fwd[i + k] == rev_comp_rev[j + k]):
-                count += 1
-                k += 1
-            max_complement = max(max_complement, count)
+    # Check overall complementarity (longest diagonal run of matches)
+    a = np.frombuffer(fwd.encode('ascii', 'replace'), dtype=np.uint8)
+    b = np.frombuffer(rev_comp_rev.encode('ascii', 'replace'), dtype=np.uint8)
+    max_complement = int(_match_run(a, b, len(fwd) - 3, len(rev_comp_rev) - 3))
     
     # Estimate dimer formation energy
     estimated_dG = -1.5 * max_complement
@@ -181,8 +346,7 @@ def check_gc_clamp(seq):
     if len(seq) < 5:
         return {'has_clamp': False, 'gc_in_last_5': 0, 'is_optimal': False}
     
-    last_5 = seq[-5:].upper()
-    gc_count = last_5.count('G') + last_5.count('C')
+    gc_count = primer_scan(seq.upper()).gc_in_last_5
     has_clamp = seq[-1] in ['G', 'C']
     
     return {
@@ -192,10 +356,12 @@ def check_gc_clamp(seq):
     }
 
 
-def evaluate_primer_quality(primer_seq, tm, hairpin_data=None, gc_clamp_data=None):
+def evaluate_primer_quality(primer_seq, tm, hairpin_data=None, gc_clamp_data=None, gc_content=None):
     """
     Enhanced primer quality evaluation
     
+    gc_content may be passed in when the caller has already computed it.
+    
     Returns:
         tuple: (quality_grade, quality_score, issues, warnings)
     """
@@ -205,6 +371,7 @@ def evaluate_primer_quality(primer_seq, tm, hairpin_data=None, gc_clamp_data=Non
     
     primer_seq = primer_seq.upper()
     length = len(primer_seq)
+    scan = primer_scan(primer_seq)
     
     # Length check (optimal: 18-25 bp)
     if length < 18:
@@ -232,7 +399,7 @@ def evaluate_primer_quality(primer_seq, tm, hairpin_data=None, gc_clamp_data=Non
         score -= 5
     
     # GC content check (optimal: 40-60%)
-    gc = calculate_gc_content(primer_seq)
+    gc = _gc_percent(scan.gc_count, length) if gc_content is None else gc_content
     if gc < 35:
         issues.append(f"GC content too low ({gc}%) - poor stability")
         score -= 20
@@ -260,12 +427,12 @@ def evaluate_primer_quality(primer_seq, tm, hairpin_data=None, gc_clamp_data=Non
                 score -= 5
     
     # Check for runs of same nucleotide (poly-X)
-    for base in ['A', 'T', 'G', 'C']:
-        if base * 4 in primer_seq:
+    for base, run in zip('ATGC', scan.poly_runs):
+        if run >= 4:
             issues.append(f"Contains poly-{base} run (≥4) - avoid!")
             score -= 20
             break
-        elif base * 3 in primer_seq:
+        elif run:
             warnings.append(f"Contains {base*3} - may cause issues")
             score -= 5
     
@@ -280,9 +447,9 @@ def evaluate_primer_quality(primer_seq, tm, hairpin_data=None, gc_clamp_data=Non
     
     # Check for self-complementarity at 3' end
     if len(primer_seq) >= 6:
+        # Same as end_3 in reverse_complement(primer_seq), with a 6-base complement
         end_3 = primer_seq[-6:]
-        rev_comp = reverse_complement(primer_seq)
-        if end_3 in rev_comp:
+        if reverse_complement(end_3) in primer_seq:
             warnings.append("Possible 3' self-complementarity")
             score -= 10
     
@@ -300,20 +467,14 @@ def evaluate_primer_quality(primer_seq, tm, hairpin_data=None, gc_clamp_data=Non
     return grade, score, issues, warnings
 
 
-def suggest_pcr_protocol(fwd_primer, rev_primer, product_size):
-    """
-    Generate PCR protocol recommendations
-    
-    Returns:
-        dict: Protocol parameters
-    """
-    avg_tm = (fwd_primer['tm'] + rev_primer['tm']) / 2
-    
+@functools.lru_cache(maxsize=256)
+def _protocol_parameters(avg_tm, product_size, has_issues):
+    """Cached suggest_pcr_protocol values as an (annealing_temp, extension_time, cycles, polymerase, notes) tuple"""
     # Annealing temperature (typically Tm - 5°C)
     annealing_temp = round(avg_tm - 5, 1)
     
-    # Extension time (1 min per kb, minimum 30s)
-    extension_time = max(30, math.ceil(product_size / 1000) * 60)
+    # Extension time (1 min per started kb, minimum 30s)
+    extension_time = max(30, -(-product_size // 1000) * 60)
     
     # Cycle recommendation
     cycles = 30 if product_size < 1000 else 35
@@ -332,9 +493,24 @@ def suggest_pcr_protocol(fwd_primer, rev_primer, product_size):
         notes.append("Short amplicon - reduce extension time to 15-30s")
     if avg_tm < 55:
         notes.append("Low Tm - consider touchdown PCR (start at 60°C, -0.5°C/cycle)")
-    if fwd_primer.get('issues') or rev_primer.get('issues'):
+    if has_issues:
         notes.append("Primer quality concerns - optimize if poor results")
     
+    return annealing_temp, extension_time, cycles, polymerase, tuple(notes)
+
+
+def suggest_pcr_protocol(fwd_primer, rev_primer, product_size):
+    """
+    Generate PCR protocol recommendations
+    
+    Returns:
+        dict: Protocol parameters
+    """
+    avg_tm = (fwd_primer['tm'] + rev_primer['tm']) / 2
+    has_issues = bool(fwd_primer.get('issues') or rev_primer.get('issues'))
+    annealing_temp, extension_time, cycles, polymerase, notes = _protocol_parameters(
+        avg_tm, product_size, has_issues)
+    
     return {
         'annealing_temp': annealing_temp,
         'annealing_range': [annealing_temp - 2, annealing_temp + 3],
@@ -343,16 +519,237 @@ def suggest_pcr_protocol(fwd_primer, rev_primer, product_size):
         'polymerase': polymerase,
         'denaturation': {'temp': 95, 'time': 30},
         'final_extension': {'temp': 72, 'time': 300},
-        'notes': notes
+        'notes': list(notes)
     }
 
 
+def _window_tms(arr, starts, primer_length, reverse=False, primer_conc=0.5, salt_conc=50):
+    """
+    calculate_tm_nearest_neighbor of every primer_length window of arr that
+    begins at one of starts (increasing), or of its reverse complement
+    
+    Each window's steps are summed in the same order as the scalar function,
+    so the rounded results are identical; every window is handled at once.
+    """
+    starts = np.asarray(starts, dtype=np.intp)
+    if primer_length < 14 or starts.size == 0:
+        windows = (arr[i:i + primer_length].tobytes().decode('ascii') for i in starts.tolist())
+        return [calculate_tm_nearest_neighbor(reverse_complement(w) if reverse else w, primer_conc, salt_conc)
+                for w in windows]
+    
+    arr = arr[starts[0]:starts[-1] + primer_length]
+    starts = starts - starts[0]
+    if reverse:
+        # Reverse-complement step p pairs comp(arr[p+1]) with comp(arr[p]),
+        # and its steps run from the 3' end of the window
+        comp = np.frombuffer(arr.tobytes().translate(_RC_TABLE), dtype=np.uint8)
+        codes = _NN_FIRST[comp[1:]] + _NN_SECOND[comp[:-1]]
+        offsets = range(primer_length - 2, -1, -1)
+    else:
+        codes = _NN_FIRST[arr[:-1]] + _NN_SECOND[arr[1:]]
+        offsets = range(primer_length - 1)
+    
+    totals = np.zeros((starts.size, 2))
+    for k in offsets:
+        totals += _NN_TABLE[codes[starts + k]]
+    tm = make_tm_fn(primer_length, primer_conc, salt_conc)(totals[:, 0], totals[:, 1])
+    return [round(t, 1) for t in tm.tolist()]
+
+
+def _score_bound(primer_seq, tm, gc):
+    """Quality score before the hairpin check, which can only lower it"""
+    return evaluate_primer_quality(primer_seq, tm, None, check_gc_clamp(primer_seq), gc)[1]
+
+
+@njit(cache=True, nogil=True)
+def _score_windows_nb(strand, starts, primer_length, tms, gcs, comp):
+    """
+    evaluate_primer_quality score of each primer_length window of strand,
+    with check_gc_clamp and check_hairpin data, from its Tm and GC content
+    
+    Mirrors the rules of evaluate_primer_quality. The kernel is serial and
+    releases the GIL: a parallel kernel called from several request threads
+    at once aborts the process under numba's default workqueue layer.
+    """
+    L = primer_length
+    scores = np.empty(starts.shape[0], dtype=np.int64)
+    for w in range(starts.shape[0]):
+        p = strand[starts[w]:starts[w] + L]
+        score = 100
+        
+        # Length, Tm and GC content
+        if L < 18:
+            score -= 20
+        elif L < 20:
+            score -= 5
+        elif L > 25:
+            score -= 10
+        if tms[w] < 52:
+            score -= 20
+        elif tms[w] < 55:
+            score -= 10
+        elif tms[w] > 68:
+            score -= 15
+        elif tms[w] > 65:
+            score -= 5
+        if gcs[w] < 35:
+            score -= 20
+        elif gcs[w] < 40:
+            score -= 10
+        elif gcs[w] > 65:
+            score -= 20
+        elif gcs[w] > 60:
+            score -= 10
+        
+        # GC clamp
+        gc_in_last_5 = 0
+        has_clamp = False
+        if L >= 5:
+            for k in range(L - 5, L):
+                if p[k] == 71 or p[k] == 67:
+                    gc_in_last_5 += 1
+            has_clamp = p[L - 1] == 71 or p[L - 1] == 67
+        if not has_clamp:
+            score -= 10
+        if not (2 <= gc_in_last_5 <= 3 and has_clamp):
+            if gc_in_last_5 < 2 or gc_in_last_5 > 3:
+                score -= 5
+        
+        # Poly-X runs, checked for A, T, G, C in turn
+        for base in (65, 84, 71, 67):
+            run = 0
+            longest = 0
+            for k in range(L):
+                run = run + 1 if p[k] == base else 0
+                longest = max(longest, run)
+            if longest >= 4:
+                score -= 20
+                break
+            elif longest >= 3:
+                score -= 5
+        
+        # Hairpin risk from the longest stem against the reverse complement
+        rc = np.empty(L, dtype=np.uint8)
+        for j in range(L):
+            rc[j] = comp[p[L - 1 - j]]
+        stem = _match_run(p, rc, L - 3, L - 3)
+        estimated_dG = -1.5 * stem if stem >= 4 else 0.0
+        if estimated_dG < -5:
+            score -= 20
+        elif estimated_dG < -3:
+            score -= 10
+        
+        # 3' self-complementarity: the tail's reverse complement in the primer
+        if L >= 6:
+            for q in range(L - 5):
+                hit = True
+                for k in range(6):
+                    if p[q + k] != comp[p[L - 1 - k]]:
+                        hit = False
+                        break
+                if hit:
+                    score -= 10
+                    break
+        
+        scores[w] = max(0, score)
+    return scores
+
+
+def _window_scores(strand, starts, primer_length, tms, gcs):
+    """
+    Quality score of each primer_length window of strand, for _top_candidates
+    
+    Exact with numba; otherwise the _score_bound of each window, since the
+    kernel would run as slow Python.
+    """
+    if HAVE_NUMBA:
+        return _score_windows_nb(strand, np.asarray(starts, dtype=np.intp), primer_length,
+                                 np.asarray(tms, dtype=np.float64), np.asarray(gcs, dtype=np.float64),
+                                 _COMP_CODES).tolist()
+    windows = (strand[i:i + primer_length].tobytes().decode('ascii') for i in starts)
+    return [_score_bound(primer_seq, tm, gc) for primer_seq, tm, gc in zip(windows, tms, gcs)]
+
+
+def _ranked_candidate(window, primer_type, rank_key):
+    """Fully evaluated candidate dict for a (sequence, position, tm, gc) window, with its rank key"""
+    primer_seq, position, tm, gc = window
+    hairpin = check_hairpin(primer_seq)
+    gc_clamp = check_gc_clamp(primer_seq)
+    grade, score, issues, warnings = evaluate_primer_quality(primer_seq, tm, hairpin, gc_clamp, gc)
+    
+    candidate = {
+        'sequence': primer_seq,
+        'position': position,
+        'length': len(primer_seq),
+        'tm': tm,
+        'gc_content': gc,
+        'quality_grade': grade,
+        'quality_score': score,
+        'issues': issues,
+        'warnings': warnings,
+        'hairpin': hairpin,
+        'gc_clamp': gc_clamp,
+        'type': primer_type
+    }
+    return rank_key(candidate), candidate
+
+
+def _candidate_table(positions, tms, gcs, scores, target_tm=None):
+    """
+    CAND_DTYPE array of primer windows, and the window indices in rank order
+    
+    Windows rank by score (best first), then by Tm gap to target_tm when
+    given, then by position.
+    """
+    cands = np.empty(len(positions), dtype=CAND_DTYPE)
+    cands['position'] = positions
+    cands['tm'] = tms
+    cands['gc'] = gcs
+    cands['score'] = scores
+    if target_tm is None:
+        cands['tm_gap'] = 0
+    else:
+        cands['tm_gap'] = np.abs(cands['tm'] - target_tm)
+    order = np.lexsort((cands['position'], cands['tm_gap'], -cands['score']))
+    return cands, order.tolist()
+
+
+def _top_candidates(cands, order, evaluate, k=5):
+    """
+    The k best candidates, fully evaluating as few as possible
+    
+    order lists rows of cands by their (-score, tm_gap, position) bound;
+    evaluate(index) returns (rank_key, candidate) with rank_key no better
+    than that bound, smaller being better. Keys must be unique. Rows are
+    evaluated in order until no remaining one can make the top k.
+    
+    Returns:
+        list: Up to k candidates, best first
+    """
+    scores = cands['score']
+    tm_gaps = cands['tm_gap']
+    positions = cands['position']
+    best = []
+    for index in order:
+        if len(best) >= k and best[k - 1][0] < (-int(scores[index]), float(tm_gaps[index]), int(positions[index])):
+            break
+        best.append(evaluate(index))
+        best.sort(key=lambda item: item[0])
+        del best[k:]
+    return [candidate for _, candidate in best]
+
+
 def design_primers(sequence, target_tm=60, primer_length=20, product_size_range=(200, 500)):
     """
     Enhanced primer design with advanced analysis
     Handles both long and short sequences automatically
     """
-    sequence = sequence.upper()
+    # Uppercase once; window GC counts come from the whole-sequence prefix sums
+    sequence = as_sequence(sequence)
+    arr = sequence.array()
+    rc_arr = np.frombuffer(sequence.rc(), dtype=np.uint8)
+    gc_prefix = sequence.gc_prefix()
+    sequence = sequence.text
     min_size, max_size = product_size_range
     seq_length = len(sequence)
     
@@ -365,9 +762,10 @@ def design_primers(sequence, target_tm=60, primer_length=20, product_size_range=
         if adjusted_max > adjusted_min:
             min_size = adjusted_min
             max_size = adjusted_max
-            print(f"Short sequence detected ({seq_length} bp). Adjusted product size: {min_size}-{max_size} bp")
+            logger.info("Short sequence detected (%d bp). Adjusted product size: %d-%d bp",
+                        seq_length, min_size, max_size)
         else:
-            print(f"Sequence too short ({seq_length} bp) for reliable primer design")
+            logger.warning("Sequence too short (%d bp) for reliable primer design", seq_length)
             return {
                 'forward_primer': None,
                 'reverse_primer': None,
@@ -379,39 +777,24 @@ def design_primers(sequence, target_tm=60, primer_length=20, product_size_range=
             }
     
     # === FIND FORWARD PRIMERS ===
-    forward_candidates = []
+    # Tm, GC content and scores come from whole-sequence passes; full
+    # candidate dicts are only built for windows that can make the top 5
     search_end_fwd = min(100, int(seq_length * 0.3), seq_length - primer_length - 20)
+    fwd_starts = range(0, max(0, min(search_end_fwd, seq_length - primer_length + 1)))
+    fwd_tms = _window_tms(arr, fwd_starts, primer_length)
+    fwd_gcs = [_gc_percent(gc_prefix[i + primer_length] - gc_prefix[i], primer_length) for i in fwd_starts]
+    fwd_scores = _window_scores(arr, fwd_starts, primer_length, fwd_tms, fwd_gcs)
+    fwd_cands, fwd_order = _candidate_table(fwd_starts, fwd_tms, fwd_gcs, fwd_scores)
     
-    for i in range(0, search_end_fwd):
-        if i + primer_length > seq_length:
-            break
-            
-        primer_seq = sequence[i:i + primer_length]
-        if len(primer_seq) < primer_length:
-            continue
-            
-        tm = calculate_tm_nearest_neighbor(primer_seq)
-        hairpin = check_hairpin(primer_seq)
-        gc_clamp = check_gc_clamp(primer_seq)
-        grade, score, issues, warnings = evaluate_primer_quality(primer_seq, tm, hairpin, gc_clamp)
-        
-        forward_candidates.append({
-            'sequence': primer_seq,
-            'position': i,
-            'length': len(primer_seq),
-            'tm': tm,
-            'gc_content': calculate_gc_content(primer_seq),
-            'quality_grade': grade,
-            'quality_score': score,
-            'issues': issues,
-            'warnings': warnings,
-            'hairpin': hairpin,
-            'gc_clamp': gc_clamp,
-            'type': 'Forward'
-        })
+    def forward_candidate(k):
+        i = fwd_starts[k]
+        window = (sequence[i:i + primer_length], i, fwd_tms[k], fwd_gcs[k])
+        return _ranked_candidate(window, 'Forward', lambda c: (-c['quality_score'], 0, c['position']))
+    
+    forward_candidates = _top_candidates(fwd_cands, fwd_order, forward_candidate)
     
     if not forward_candidates:
-        print("No forward primer candidates found")
+        logger.warning("No forward primer candidates found")
         return {
             'forward_primer': None,
             'reverse_primer': None,
@@ -422,52 +805,39 @@ def design_primers(sequence, target_tm=60, primer_length=20, product_size_range=
             'all_candidates': []
         }
     
-    forward_candidates.sort(key=lambda x: x['quality_score'], reverse=True)
     best_forward = forward_candidates[0]
     
     # === FIND REVERSE PRIMERS ===
-    reverse_candidates = []
     search_start_rev = max(
         best_forward['position'] + min_size,
         int(seq_length * 0.5)
     )
     search_end_rev = seq_length - primer_length
-    
-    for i in range(search_start_rev, search_end_rev + 1):
-        if i + primer_length > seq_length:
-            break
-            
-        primer_region = sequence[i:i + primer_length]
-        if len(primer_region) < primer_length:
-            continue
-            
-        primer_seq = reverse_complement(primer_region)
-        tm = calculate_tm_nearest_neighbor(primer_seq)
-        hairpin = check_hairpin(primer_seq)
-        gc_clamp = check_gc_clamp(primer_seq)
-        grade, score, issues, warnings = evaluate_primer_quality(primer_seq, tm, hairpin, gc_clamp)
-        
-        expected_size = i - best_forward['position'] + primer_length
-        
-        if min_size <= expected_size <= max_size:
-            reverse_candidates.append({
-                'sequence': primer_seq,
-                'position': i,
-                'length': len(primer_seq),
-                'tm': tm,
-                'gc_content': calculate_gc_content(primer_seq),
-                'quality_grade': grade,
-                'quality_score': score,
-                'issues': issues,
-                'warnings': warnings,
-                'hairpin': hairpin,
-                'gc_clamp': gc_clamp,
-                'type': 'Reverse',
-                'expected_product': expected_size
-            })
+    # Starts whose product size falls in range form one contiguous interval
+    size_offset = best_forward['position'] - primer_length
+    rev_starts = range(max(search_start_rev, min_size + size_offset),
+                       min(search_end_rev, max_size + size_offset) + 1)
+    rev_tms = _window_tms(arr, rev_starts, primer_length, reverse=True)
+    rev_gcs = [_gc_percent(gc_prefix[i + primer_length] - gc_prefix[i], primer_length) for i in rev_starts]
+    # A reverse primer is a window of the reverse-complement strand
+    rc_starts = [seq_length - primer_length - i for i in rev_starts]
+    rev_scores = _window_scores(rc_arr, rc_starts, primer_length, rev_tms, rev_gcs)
+    # Best quality first, then the Tm closest to the forward primer's
+    rev_cands, rev_order = _candidate_table(rev_starts, rev_tms, rev_gcs, rev_scores, best_forward['tm'])
+    
+    def reverse_candidate(k):
+        i = rev_starts[k]
+        window = (reverse_complement(sequence[i:i + primer_length]), i, rev_tms[k], rev_gcs[k])
+        return _ranked_candidate(window, 'Reverse',
+                                 lambda c: (-c['quality_score'], abs(c['tm'] - best_forward['tm']), c['position']))
+    
+    reverse_candidates = _top_candidates(rev_cands, rev_order, reverse_candidate)
+    
+    for candidate in reverse_candidates:
+        candidate['expected_product'] = candidate['position'] - best_forward['position'] + primer_length
     
     if not reverse_candidates:
-        print(f"No reverse primer candidates found")
+        logger.warning("No reverse primer candidates found")
         return {
             'forward_primer': best_forward,
             'reverse_primer': None,
@@ -478,10 +848,6 @@ def design_primers(sequence, target_tm=60, primer_length=20, product_size_range=
             'all_candidates': forward_candidates[:5]
         }
     
-    reverse_candidates.sort(
-        key=lambda x: (x['quality_score'], -abs(x['tm'] - best_forward['tm'])),
-        reverse=True
-    )
     best_reverse = reverse_candidates[0]
     
     # === ANALYZE PRIMER PAIR ===
@@ -492,8 +858,9 @@ def design_primers(sequence, target_tm=60, primer_length=20, product_size_range=
     
     all_candidates = forward_candidates[:5] + reverse_candidates[:5]
     
-    print(f"✓ Found primers: Forward at {best_forward['position']}, Reverse at {best_reverse['position']}")
-    print(f"✓ Expected product: {expected_size} bp, Tm diff: {tm_diff:.1f}°C")
+    logger.info("Found primers: Forward at %d, Reverse at %d",
+                best_forward['position'], best_reverse['position'])
+    logger.info("Expected product: %d bp, Tm diff: %.1f°C", expected_size, tm_diff)
     
     return {
         'forward_primer': best_forward,
@@ -508,6 +875,7 @@ def design_primers(sequence, target_tm=60, primer_length=20, product_size_range=
 
 # Test function
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     test_seq = "ATGCTAGGATCGTACCTTGATCGGAATTCGATCGTACGATTAAGCTAGCTTGCTAGCTAGCTAGCTAGCTAGCTAGCT"
     print("Testing PCR Primer Designer...")
     print(f"Input sequence: {test_seq}")
@@ -3,17 +3,45 @@ DNA Sequence Analyzer - Flask Backend API
 Provides endpoints for mutations, alignment, CRISPR, and primer design
 Now with FREE AI explanations powered by Groq!
 """
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import logging.handlers
+import multiprocessing
 import os
-import sys
-import requests
-from datetime import datetime, timedelta
-from collections import defaultdict
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
+import requests
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
+from flask import Flask, Response, abort, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # optional faster JSON encoding/decoding for requests and responses
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional Brotli/gzip response compression; plain gzip is used without it
+    Compress = None
 
-from algorithms.alignment import needleman_wunsch, smith_waterman, calculate_alignment_stats
+try:
+    from limits import parse as parse_rate_limit
+    from limits.storage import storage_from_string
+    from limits.strategies import FixedWindowRateLimiter
+except ImportError:  # optional shared rate limiting across workers; per-process limits are used without it
+    FixedWindowRateLimiter = None
+
+from algorithms.alignment import BACKENDS, needleman_wunsch, smith_waterman, calculate_alignment_stats
 from algorithms.mutation_finder import find_mutations
 from algorithms.crispr import find_pam_sites
 from algorithms.primer_design import design_primers
@@ -21,12 +49,103 @@ from algorithms.primer_design import design_primers
 # Load environment variables FIRST
 load_dotenv()
 
+# Request threads only enqueue log records; a background listener writes them
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+log_listener = None
+
+
+def start_log_listener():
+    """Route the module logger through a new queue and listener thread"""
+    global log_listener
+    log_queue = queue.SimpleQueue()
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    log_listener = logging.handlers.QueueListener(log_queue, _log_output)
+    log_listener.start()
+
+
+def stop_log_listener():
+    """Flush queued log records and stop the listener thread"""
+    log_listener.stop()
+
+
+# The listener thread does not survive fork, so processes forked from a
+# preloading server (gunicorn --preload) start their own
+start_log_listener()
+os.register_at_fork(after_in_child=start_log_listener)
+atexit.register(stop_log_listener)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's sorted keys and type fallbacks"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+
+def static_error(message, status):
+    """
+    Factory for a fixed JSON error response whose body is serialized once
+    
+    Each call builds a new Response, since after_request hooks modify it.
+    """
+    body = app.json.dumps({'error': message})
+    return lambda: app.response_class(body, status=status, mimetype='application/json')
+
+
+# Error responses for the most frequently rejected requests
+NO_JSON_ERROR = static_error('No JSON data provided', 400)
+SEQUENCE_TOO_LONG_ERROR = static_error('Sequence too long. Maximum 100,000 bp allowed.', 413)
+SEQUENCE_REQUIRED_ERROR = static_error('Sequence is required', 400)
+BOTH_SEQUENCES_REQUIRED_ERROR = static_error('Both sequences are required', 400)
+REQUEST_TOO_LARGE_ERROR = static_error('Request body too large. Maximum 100,000 bp per sequence.', 413)
 
 # Enable CORS for all routes
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+# Compress JSON responses of at least this many bytes (aligned sequences are
+# highly redundant text); event streams are left uncompressed so they flush
+COMPRESS_MIN_SIZE = 1024
+
+
+def gzip_response(response):
+    """gzip a large JSON response for clients that accept it"""
+    if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.mimetype != 'application/json' or 'gzip' not in request.accept_encodings
+            or (response.content_length or 0) < COMPRESS_MIN_SIZE):
+        return response
+    response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+if Compress is not None:
+    app.config.update(
+        COMPRESS_MIMETYPES=['application/json'],
+        COMPRESS_MIN_SIZE=COMPRESS_MIN_SIZE,
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_STREAMS=False
+    )
+    Compress(app)
+else:
+    app.after_request(gzip_response)
+
 # CRITICAL: Never hardcode API keys! Always use environment variables
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
@@ -40,31 +159,345 @@ if not GROQ_API_KEY:
     print("="*70 + "\n")
 
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODEL = 'llama-3.3-70b-versatile'
+GROQ_TIMEOUT = 45  # seconds
+GROQ_SYSTEM_PROMPT = 'You are an expert molecular biology assistant. Provide comprehensive, detailed explanations of scientific results. Include biological significance, practical implications, interpretation guidelines, and actionable recommendations. Use clear language that both students and researchers can understand. Be thorough but organized - use sections, examples, and specific details to make complex concepts accessible.'
+
+# Groq response bodies and stream chunks are parsed with orjson when available
+parse_json = orjson.loads if orjson is not None else json.loads
+
+# Shared session so explanation requests reuse pooled keep-alive connections
+# and the authorization header built once here
+groq_session = requests.Session()
+groq_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+if GROQ_API_KEY:
+    groq_session.headers['Authorization'] = f'Bearer {GROQ_API_KEY}'
+
+
+class LRUCache:
+    """
+    Thread-safe mapping that keeps the maxsize most recently used entries,
+    each for at most ttl seconds when ttl is given
+
+    With maxweight, entries also carry a weight (e.g. an item count) and the
+    least recently used are evicted until the total fits; entries heavier
+    than maxweight on their own are not stored.
+    """
+    
+    def __init__(self, maxsize, ttl=None, maxweight=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxweight = maxweight
+        self._entries = OrderedDict()  # key -> (value, monotonic expiry or None, weight)
+        self._weight = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """The cached value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires, weight = entry
+            if expires is not None and time.monotonic() >= expires:
+                del self._entries[key]
+                self._weight -= weight
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value, weight=1):
+        """Store value under key, evicting the least recently used beyond the limits"""
+        if self.maxweight is not None and weight > self.maxweight:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[2]
+            self._entries[key] = (value, expires, weight)
+            self._weight += weight
+            while len(self._entries) > self.maxsize or (
+                    self.maxweight is not None and self._weight > self.maxweight):
+                self._weight -= self._entries.popitem(last=False)[1][2]
+
+
+def content_key(*parts):
+    """16-byte BLAKE2b digest identifying a tuple of strings"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.digest()
+
+
+# Explanations already generated, keyed by their prompt; re-clicking Explain
+# is answered from here, and a fresh explanation is generated after an hour
+MAX_CACHED_EXPLANATIONS = 512
+EXPLANATION_CACHE_TTL = 3600  # seconds
+explanation_cache = LRUCache(MAX_CACHED_EXPLANATIONS, ttl=EXPLANATION_CACHE_TTL)
+
+# Analysis results, keyed by endpoint and normalized sequences; results
+# are only serialized, never modified, so they can be shared. Entries are
+# weighed by their number of mutations or sites (roughly 200-500 bytes
+# each), keeping the cache to tens of MB per process
+MAX_CACHED_RESULTS = 128
+MAX_CACHED_RESULT_ITEMS = 50000
+result_cache = LRUCache(MAX_CACHED_RESULTS, maxweight=MAX_CACHED_RESULT_ITEMS)
+
+
+# Non-streaming explanations being generated, by cache key; identical requests
+# arriving meanwhile wait for that result instead of calling Groq again
+pending_explanations = {}
+pending_explanations_lock = threading.Lock()
+
+
+def claim_explanation(cache_key):
+    """
+    Register the current request as the one generating an explanation
+    
+    Returns:
+        threading.Event or None: None when the caller should call Groq and
+        then release_explanation; otherwise an event set once the request
+        already generating this explanation finishes
+    """
+    with pending_explanations_lock:
+        pending = pending_explanations.get(cache_key)
+        if pending is None:
+            pending_explanations[cache_key] = threading.Event()
+        return pending
+
+
+def release_explanation(cache_key):
+    """Wake the requests waiting on an explanation claimed with claim_explanation"""
+    with pending_explanations_lock:
+        pending = pending_explanations.pop(cache_key)
+    pending.set()
+
+
+def sse_event(payload):
+    """One server-sent event carrying payload as JSON"""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def stream_explanation(response, cache_key, tool):
+    """
+    Forward a streamed Groq completion as server-sent events
+    
+    Each event carries a {'content': ...} text delta; the stream ends with a
+    'data: [DONE]' event, or an {'error': ...} event if the upstream fails.
+    The full explanation is cached once the upstream stream completes.
+    """
+    parts = []
+    completed = False
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data: '):
+                continue
+            chunk = line[len('data: '):]
+            if chunk == '[DONE]':
+                completed = True
+                break
+            payload = parse_json(chunk)
+            if 'error' in payload:
+                raise ValueError(f"upstream error event: {payload['error']}")
+            delta = payload['choices'][0].get('delta', {}).get('content')
+            if delta:
+                parts.append(delta)
+                yield sse_event({'content': delta})
+        else:
+            logger.warning("Groq stream for %s ended before [DONE]", tool)
+    except (requests.exceptions.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+        logger.warning("Groq stream error: %s", e)
+    finally:
+        response.close()
+    
+    explanation = ''.join(parts)
+    if not completed or not explanation:
+        if completed:
+            logger.warning("Groq stream for %s returned no content", tool)
+        yield sse_event({'error': 'AI service stream interrupted. Please try again.'})
+        return
+    
+    explanation_cache.put(cache_key, explanation)
+    logger.info("AI explanation streamed for %s (length: %d chars)", tool, len(explanation))
+    yield "data: [DONE]\n\n"
+
+
+# Alignment kernels: 'builtin' (numba / C extension) or 'parasail' when installed
+ALIGNMENT_BACKEND = os.getenv("ALIGNMENT_BACKEND", "builtin")
+if ALIGNMENT_BACKEND not in BACKENDS:
+    logger.warning("Unknown ALIGNMENT_BACKEND '%s', using 'builtin'. Choose from: %s",
+                   ALIGNMENT_BACKEND, ', '.join(BACKENDS))
+    ALIGNMENT_BACKEND = "builtin"
+
+
+def warm_up():
+    """
+    Compile, or load from numba's cache, the kernels behind the endpoints
+    
+    gunicorn_conf.py calls this in the master when preloading, so forked
+    workers inherit the compiled code instead of compiling on first request.
+    """
+    sample = 'ATGCGTACCTGAGCTTAGGCATCGATCCGTAAGCTTGCAGTCGACTTGA' * 8
+    needleman_wunsch(sample[:60], sample[5:70], backend=ALIGNMENT_BACKEND)
+    design_primers(sample, product_size_range=(100, 300))
+
 
 # Rate limiting configuration (simple in-memory)
-request_counts = defaultdict(list)
+# Each IP has a token bucket (tokens, last update in monotonic time) that
+# refills to MAX_REQUESTS_PER_WINDOW over RATE_LIMIT_WINDOW; IPs are kept in
+# least recently seen order so idle ones can be evicted
+request_buckets = OrderedDict()
+rate_limit_lock = threading.Lock()
 RATE_LIMIT_WINDOW = 60  # seconds
 MAX_REQUESTS_PER_WINDOW = 30  # requests per minute per IP
+REFILL_RATE = MAX_REQUESTS_PER_WINDOW / RATE_LIMIT_WINDOW  # tokens per second
+MAX_TRACKED_IPS = 100000
+RATE_LIMIT_ERROR = static_error(f'Rate limit exceeded. Maximum {MAX_REQUESTS_PER_WINDOW} requests per minute.', 429)
 
+# Large global alignments must have similar lengths: the length difference
+# is a lower bound on the edit distance that long-alignment cost grows with
+MAX_UNSCREENED_ALIGNMENT_CELLS = 4000000  # e.g. 2,000 x 2,000 bp
+MAX_ALIGNMENT_LENGTH_DIFFERENCE = 0.3  # fraction of the longer sequence
 
-def check_rate_limit(ip_address):
-    """Simple rate limiting by IP address"""
-    now = datetime.now()
-    cutoff = now - timedelta(seconds=RATE_LIMIT_WINDOW)
-    
-    # Clean old requests
-    request_counts[ip_address] = [
-        timestamp for timestamp in request_counts[ip_address]
-        if timestamp > cutoff
-    ]
-    
-    # Check limit
-    if len(request_counts[ip_address]) >= MAX_REQUESTS_PER_WINDOW:
+
+# With RATE_LIMIT_STORAGE_URI (e.g. redis://localhost:6379) set, counts are
+# kept in that shared store so the limit holds across all gunicorn workers
+RATE_LIMIT_STORAGE_URI = os.getenv('RATE_LIMIT_STORAGE_URI')
+shared_rate_limiter = None
+if RATE_LIMIT_STORAGE_URI:
+    if FixedWindowRateLimiter is None:
+        logger.warning("RATE_LIMIT_STORAGE_URI is set but 'limits' is not installed; rate limits are per process")
+    else:
+        shared_rate_limiter = FixedWindowRateLimiter(storage_from_string(RATE_LIMIT_STORAGE_URI))
+        shared_rate_limit = parse_rate_limit(f'{MAX_REQUESTS_PER_WINDOW} per {RATE_LIMIT_WINDOW} seconds')
+
+
+def take_tokens(ip_address, cost):
+    """Take cost tokens from the IP's local bucket; False (and nothing taken) if too few"""
+    with rate_limit_lock:
+        now = time.monotonic()
+        tokens, last = request_buckets.pop(ip_address, (MAX_REQUESTS_PER_WINDOW, now))
+        tokens = min(MAX_REQUESTS_PER_WINDOW, tokens + (now - last) * REFILL_RATE)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        request_buckets[ip_address] = (tokens, now)
+        
+        # Forget IPs idle long enough for their bucket to be full again, then
+        # the least recently seen ones beyond the cap
+        while len(request_buckets) > 1:
+            oldest_ip, (_, oldest) = next(iter(request_buckets.items()))
+            if now - oldest < RATE_LIMIT_WINDOW:
+                break
+            del request_buckets[oldest_ip]
+        while len(request_buckets) > MAX_TRACKED_IPS:
+            request_buckets.popitem(last=False)
+        
+        return allowed
+
+
+def check_rate_limit(ip_address, cost=1):
+    """Simple rate limiting by IP address; cost is how many requests this one counts as"""
+    # Requests the local bucket refuses never reach, or count against, the shared store
+    if not take_tokens(ip_address, cost):
         return False
+    if shared_rate_limiter is None or cost <= 0:
+        return True
+    # hit() checks and counts in one atomic step in the shared store
+    return shared_rate_limiter.hit(shared_rate_limit, 'dna-analyzer', ip_address, cost=cost)
+
+
+# Alignments and primer designs running at once in this process; further
+# ones are refused with 503 instead of queueing behind them
+MAX_CONCURRENT_COMPUTATIONS = os.cpu_count() or 2
+compute_slots = threading.BoundedSemaphore(MAX_CONCURRENT_COMPUTATIONS)
+SERVER_BUSY_ERROR = static_error('Server busy with other analyses. Please try again shortly.', 503)
+
+# Batch endpoints fan items out over a process pool, created on first use.
+# Every server process gets its own pool, so keep it small by default
+MAX_BATCH_SIZE = 20
+BATCH_POOL_WORKERS = int(os.getenv('BATCH_POOL_WORKERS', min(4, os.cpu_count() or 1)))
+batch_pool = None
+batch_pool_lock = threading.Lock()
+
+# CPUs the server may use, recorded before gunicorn pins preloaded workers
+SERVER_CPUS = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else None
+
+
+def get_batch_pool():
+    """The shared ProcessPoolExecutor for batch endpoints"""
+    global batch_pool
+    with batch_pool_lock:
+        if batch_pool is None:
+            # forkserver workers do not inherit the server's threads and locks
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else None)
+            # Pool processes may use every CPU even when this worker is pinned to one
+            initializer, initargs = (os.sched_setaffinity, (0, SERVER_CPUS)) if SERVER_CPUS else (None, ())
+            batch_pool = ProcessPoolExecutor(max_workers=BATCH_POOL_WORKERS, mp_context=context,
+                                             initializer=initializer, initargs=initargs)
+        return batch_pool
+
+
+def run_batch(func, *arg_lists):
+    """func mapped over the argument lists, in the batch pool when there is more than one item"""
+    if len(arg_lists[0]) <= 1:
+        return [func(*args) for args in zip(*arg_lists)]
+    return list(get_batch_pool().map(func, *arg_lists))
+
+
+def batch_items(data, key):
+    """
+    The list under key in a batch request, charging each item beyond the
+    first against the client's rate limit
     
-    # Add current request
-    request_counts[ip_address].append(now)
-    return True
+    Returns:
+        tuple: (items, error_response); error_response is None when valid
+    """
+    items = data.get(key)
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({'error': f"'{key}' must be a non-empty list"}), 400)
+    if len(items) > MAX_BATCH_SIZE:
+        return None, (jsonify({'error': f'Too many items. Maximum {MAX_BATCH_SIZE} per batch.'}), 400)
+    if not check_rate_limit(request.remote_addr, len(items) - 1):
+        return None, (jsonify({
+            'error': f'Rate limit exceeded. Each batch item counts toward the {MAX_REQUESTS_PER_WINDOW} requests per minute.'
+        }), 429)
+    return items, None
+
+
+# Uppercasing table and the whitespace that submitted sequences may be wrapped with
+_UPPER_TABLE = bytes.maketrans(b'abcdefghijklmnopqrstuvwxyz', b'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_SEQUENCE_WHITESPACE = b' \n\r'
+
+# Valid DNA bases in either case, deleted with bytes.translate to find invalid ones
+_DNA_BASES = b'ATGCNatgcn'
+
+
+# Raw sequence fields longer than this are rejected before normalizing; the
+# allowance over the 100,000 bp limit covers spaces and line breaks
+MAX_RAW_SEQUENCE_LENGTH = 200000
+
+# Request bodies beyond the largest valid one (a full mutations batch) are
+# refused with 413 before they are read or parsed
+app.config['MAX_CONTENT_LENGTH'] = 2 * MAX_BATCH_SIZE * MAX_RAW_SEQUENCE_LENGTH + 64 * 1024
+
+
+def raw_sequence_too_long(*sequences):
+    """Whether any submitted (not yet normalized) sequence is over MAX_RAW_SEQUENCE_LENGTH"""
+    return any(len(sequence) > MAX_RAW_SEQUENCE_LENGTH for sequence in sequences)
+
+
+def _normalize(sequence):
+    """Uppercase a submitted sequence and strip spaces and line breaks"""
+    # Clean uppercase input, the common case, is returned without a copy
+    if sequence.isascii() and sequence.isupper() and sequence.isalnum():
+        return sequence
+    if sequence.isascii():
+        return sequence.encode('ascii').translate(_UPPER_TABLE, _SEQUENCE_WHITESPACE).decode('ascii')
+    return sequence.upper().replace(' ', '').replace('\n', '').replace('\r', '')
 
 
 def validate_dna_sequence(sequence):
@@ -84,8 +517,11 @@ def validate_dna_sequence(sequence):
     if len(sequence) > 100000:
         return False, "Sequence too long. Maximum 100,000 bp allowed."
     
-    valid_bases = set('ATGCN')
-    invalid_chars = set(sequence.upper()) - valid_bases
+    # Deleting the valid bases at C level leaves only the invalid characters
+    if sequence.isascii():
+        invalid_chars = set(sequence.encode('ascii').translate(None, _DNA_BASES).decode('ascii').upper())
+    else:
+        invalid_chars = set(sequence.upper()) - set('ATGCN')
     
     if invalid_chars:
         return False, f"Invalid characters found: {', '.join(sorted(invalid_chars))}. Only A, T, G, C allowed."
@@ -93,33 +529,65 @@ def validate_dna_sequence(sequence):
     return True, None
 
 
+# Numeric primer parameters: (field, default, allowed types, minimum, maximum, error message)
+PRIMER_PARAMETERS = (
+    ('target_tm', 60, (int, float), 40, 75, 'Target Tm must be between 40 and 75°C'),
+    ('primer_length', 20, int, 15, 30, 'Primer length must be between 15 and 30 bp'),
+)
+
+
+def validate_numeric(data, schema):
+    """
+    Read numeric request fields, stopping at the first one out of range
+    
+    Args:
+        data: Parsed JSON request body
+        schema: Sequence of (field, default, types, minimum, maximum, message)
+        
+    Returns:
+        tuple: (values, error_message); error_message is None when all are valid
+    """
+    values = []
+    for field, default, types, minimum, maximum, message in schema:
+        value = data.get(field, default)
+        if not isinstance(value, types) or not minimum <= value <= maximum:
+            return None, message
+        values.append(value)
+    return values, None
+
+
 @app.before_request
 def before_request():
     """Apply rate limiting to all requests"""
+    # Refuse oversized bodies up front, before an endpoint tries to read them
+    if request.content_length is not None and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        abort(413)
+    
     # Skip rate limiting for health check
     if request.endpoint == 'health':
         return None
     
     client_ip = request.remote_addr
     if not check_rate_limit(client_ip):
-        return jsonify({
-            'error': 'Rate limit exceeded. Maximum 30 requests per minute.'
-        }), 429
+        return RATE_LIMIT_ERROR()
 
 
 @app.route('/api/mutations', methods=['POST'])
 def mutations():
     """Find mutations between two DNA sequences"""
     try:
-        data = request.json
+        data = request.get_json(silent=True, cache=False)
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return NO_JSON_ERROR()
         
-        seq1 = data.get('sequence1', '').upper().replace(' ', '').replace('\n', '').replace('\r', '')
-        seq2 = data.get('sequence2', '').upper().replace(' ', '').replace('\n', '').replace('\r', '')
+        if raw_sequence_too_long(data.get('sequence1', ''), data.get('sequence2', '')):
+            return SEQUENCE_TOO_LONG_ERROR()
+        
+        seq1 = _normalize(data.get('sequence1', ''))
+        seq2 = _normalize(data.get('sequence2', ''))
         
         if not seq1 or not seq2:
-            return jsonify({'error': 'Both sequences are required'}), 400
+            return BOTH_SEQUENCES_REQUIRED_ERROR()
         
         is_valid1, error1 = validate_dna_sequence(seq1)
         if not is_valid1:
@@ -129,11 +597,15 @@ def mutations():
         if not is_valid2:
             return jsonify({'error': f'Sequence 2: {error2}'}), 400
         
-        result = find_mutations(seq1, seq2)
+        cache_key = content_key('mutations', seq1, seq2)
+        result = result_cache.get(cache_key)
+        if result is None:
+            result = find_mutations(seq1, seq2)
+            result_cache.put(cache_key, result, weight=len(result['mutations']))
         return jsonify(result)
     
-    except Exception as e:
-        print(f"Error in mutations endpoint: {str(e)}")
+    except Exception:
+        logger.exception("Error in mutations endpoint")
         return jsonify({'error': 'Internal server error. Please try again.'}), 500
 
 
@@ -141,21 +613,30 @@ def mutations():
 def align():
     """Perform sequence alignment"""
     try:
-        data = request.json
+        data = request.get_json(silent=True, cache=False)
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return NO_JSON_ERROR()
+        
+        if raw_sequence_too_long(data.get('sequence1', ''), data.get('sequence2', '')):
+            return SEQUENCE_TOO_LONG_ERROR()
         
-        seq1 = data.get('sequence1', '').upper().replace(' ', '').replace('\n', '').replace('\r', '')
-        seq2 = data.get('sequence2', '').upper().replace(' ', '').replace('\n', '').replace('\r', '')
+        seq1 = _normalize(data.get('sequence1', ''))
+        seq2 = _normalize(data.get('sequence2', ''))
         algorithm = data.get('algorithm', 'global')
         
         if not seq1 or not seq2:
-            return jsonify({'error': 'Both sequences are required'}), 400
+            return BOTH_SEQUENCES_REQUIRED_ERROR()
         
         # Limit sequence length for alignment (computationally expensive)
         if len(seq1) > 10000 or len(seq2) > 10000:
             return jsonify({'error': 'Sequences too long for alignment. Maximum 10,000 bp.'}), 400
         
+        longest = max(len(seq1), len(seq2))
+        if (algorithm == 'global' and len(seq1) * len(seq2) > MAX_UNSCREENED_ALIGNMENT_CELLS
+                and abs(len(seq1) - len(seq2)) > MAX_ALIGNMENT_LENGTH_DIFFERENCE * longest):
+            return jsonify({'error': 'Sequence lengths differ too much for global alignment at this size. '
+                                     'Keep the difference within 30% or use local alignment.'}), 400
+        
         is_valid1, error1 = validate_dna_sequence(seq1)
         if not is_valid1:
             return jsonify({'error': f'Sequence 1: {error1}'}), 400
@@ -164,12 +645,17 @@ def align():
         if not is_valid2:
             return jsonify({'error': f'Sequence 2: {error2}'}), 400
         
-        if algorithm == 'global':
-            align1, align2, score = needleman_wunsch(seq1, seq2)
-            algorithm_name = 'Needleman-Wunsch (Global Alignment)'
-        else:
-            align1, align2, score = smith_waterman(seq1, seq2)
-            algorithm_name = 'Smith-Waterman (Local Alignment)'
+        if not compute_slots.acquire(blocking=False):
+            return SERVER_BUSY_ERROR()
+        try:
+            if algorithm == 'global':
+                align1, align2, score = needleman_wunsch(seq1, seq2, backend=ALIGNMENT_BACKEND)
+                algorithm_name = 'Needleman-Wunsch (Global Alignment)'
+            else:
+                align1, align2, score = smith_waterman(seq1, seq2, backend=ALIGNMENT_BACKEND)
+                algorithm_name = 'Smith-Waterman (Local Alignment)'
+        finally:
+            compute_slots.release()
         
         stats = calculate_alignment_stats(align1, align2)
         
@@ -187,8 +673,8 @@ def align():
         
         return jsonify(result)
     
-    except Exception as e:
-        print(f"Error in align endpoint: {str(e)}")
+    except Exception:
+        logger.exception("Error in align endpoint")
         return jsonify({'error': 'Internal server error. Please try again.'}), 500
 
 
@@ -196,24 +682,104 @@ def align():
 def crispr():
     """Find CRISPR PAM sites"""
     try:
-        data = request.json
+        data = request.get_json(silent=True, cache=False)
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return NO_JSON_ERROR()
+        
+        if raw_sequence_too_long(data.get('sequence', '')):
+            return SEQUENCE_TOO_LONG_ERROR()
         
-        sequence = data.get('sequence', '').upper().replace(' ', '').replace('\n', '').replace('\r', '')
+        sequence = _normalize(data.get('sequence', ''))
         
         if not sequence:
-            return jsonify({'error': 'Sequence is required'}), 400
+            return SEQUENCE_REQUIRED_ERROR()
         
         is_valid, error = validate_dna_sequence(sequence)
         if not is_valid:
             return jsonify({'error': error}), 400
         
-        result = find_pam_sites(sequence)
+        cache_key = content_key('crispr', sequence)
+        result = result_cache.get(cache_key)
+        if result is None:
+            result = find_pam_sites(sequence)
+            result_cache.put(cache_key, result, weight=len(result['sites']))
         return jsonify(result)
     
-    except Exception as e:
-        print(f"Error in crispr endpoint: {str(e)}")
+    except Exception:
+        logger.exception("Error in crispr endpoint")
+        return jsonify({'error': 'Internal server error. Please try again.'}), 500
+
+
+@app.route('/api/mutations/batch', methods=['POST'])
+def mutations_batch():
+    """Find mutations for several sequence pairs, given as {'pairs': [{'sequence1', 'sequence2'}, ...]}"""
+    try:
+        data = request.get_json(silent=True, cache=False)
+        if not data:
+            return NO_JSON_ERROR()
+        
+        pairs, error_response = batch_items(data, 'pairs')
+        if error_response:
+            return error_response
+        
+        seqs1, seqs2 = [], []
+        for n, pair in enumerate(pairs, 1):
+            if not isinstance(pair, dict):
+                return jsonify({'error': f'Pair {n}: must be an object with sequence1 and sequence2'}), 400
+            if raw_sequence_too_long(pair.get('sequence1', ''), pair.get('sequence2', '')):
+                return jsonify({'error': f'Pair {n}: Sequence too long. Maximum 100,000 bp allowed.'}), 413
+            
+            seq1 = _normalize(pair.get('sequence1', ''))
+            seq2 = _normalize(pair.get('sequence2', ''))
+            if not seq1 or not seq2:
+                return jsonify({'error': f'Pair {n}: Both sequences are required'}), 400
+            
+            for label, seq in (('Sequence 1', seq1), ('Sequence 2', seq2)):
+                is_valid, error = validate_dna_sequence(seq)
+                if not is_valid:
+                    return jsonify({'error': f'Pair {n}, {label}: {error}'}), 400
+            seqs1.append(seq1)
+            seqs2.append(seq2)
+        
+        return jsonify({'results': run_batch(find_mutations, seqs1, seqs2), 'count': len(seqs1)})
+    
+    except Exception:
+        logger.exception("Error in mutations batch endpoint")
+        return jsonify({'error': 'Internal server error. Please try again.'}), 500
+
+
+@app.route('/api/crispr/batch', methods=['POST'])
+def crispr_batch():
+    """Find CRISPR PAM sites in several sequences, given as {'sequences': [...]}"""
+    try:
+        data = request.get_json(silent=True, cache=False)
+        if not data:
+            return NO_JSON_ERROR()
+        
+        raw_sequences, error_response = batch_items(data, 'sequences')
+        if error_response:
+            return error_response
+        
+        sequences = []
+        for n, raw in enumerate(raw_sequences, 1):
+            if not isinstance(raw, str):
+                return jsonify({'error': f'Sequence {n}: must be a string'}), 400
+            if raw_sequence_too_long(raw):
+                return jsonify({'error': f'Sequence {n}: Sequence too long. Maximum 100,000 bp allowed.'}), 413
+            
+            sequence = _normalize(raw)
+            if not sequence:
+                return jsonify({'error': f'Sequence {n}: Sequence is required'}), 400
+            
+            is_valid, error = validate_dna_sequence(sequence)
+            if not is_valid:
+                return jsonify({'error': f'Sequence {n}: {error}'}), 400
+            sequences.append(sequence)
+        
+        return jsonify({'results': run_batch(find_pam_sites, sequences), 'count': len(sequences)})
+    
+    except Exception:
+        logger.exception("Error in crispr batch endpoint")
         return jsonify({'error': 'Internal server error. Please try again.'}), 500
 
 
@@ -221,14 +787,17 @@ def crispr():
 def primers():
     """Design PCR primers with enhanced analysis"""
     try:
-        data = request.json
+        data = request.get_json(silent=True, cache=False)
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return NO_JSON_ERROR()
+        
+        if raw_sequence_too_long(data.get('sequence', '')):
+            return SEQUENCE_TOO_LONG_ERROR()
         
-        sequence = data.get('sequence', '').upper().replace(' ', '').replace('\n', '').replace('\r', '')
+        sequence = _normalize(data.get('sequence', ''))
         
         if not sequence:
-            return jsonify({'error': 'Sequence is required'}), 400
+            return SEQUENCE_REQUIRED_ERROR()
         
         is_valid, error = validate_dna_sequence(sequence)
         if not is_valid:
@@ -240,16 +809,12 @@ def primers():
         if len(sequence) > 50000:
             return jsonify({'error': 'Sequence too long. Maximum 50,000 bp for primer design.'}), 400
         
-        target_tm = data.get('target_tm', 60)
-        primer_length = data.get('primer_length', 20)
-        product_size_range = data.get('product_size_range', [200, 500])
-        
-        if not isinstance(target_tm, (int, float)) or target_tm < 40 or target_tm > 75:
-            return jsonify({'error': 'Target Tm must be between 40 and 75°C'}), 400
-        
-        if not isinstance(primer_length, int) or primer_length < 15 or primer_length > 30:
-            return jsonify({'error': 'Primer length must be between 15 and 30 bp'}), 400
+        values, error = validate_numeric(data, PRIMER_PARAMETERS)
+        if error:
+            return jsonify({'error': error}), 400
+        target_tm, primer_length = values
         
+        product_size_range = data.get('product_size_range', [200, 500])
         if not isinstance(product_size_range, list) or len(product_size_range) != 2:
             return jsonify({'error': 'Product size range must be a list of [min, max]'}), 400
         
@@ -257,12 +822,17 @@ def primers():
         if min_size >= max_size or min_size < 50:
             return jsonify({'error': 'Invalid product size range. Min must be < Max and >= 50'}), 400
         
-        result = design_primers(
-            sequence=sequence,
-            target_tm=target_tm,
-            primer_length=primer_length,
-            product_size_range=tuple(product_size_range)
-        )
+        if not compute_slots.acquire(blocking=False):
+            return SERVER_BUSY_ERROR()
+        try:
+            result = design_primers(
+                sequence=sequence,
+                target_tm=target_tm,
+                primer_length=primer_length,
+                product_size_range=tuple(product_size_range)
+            )
+        finally:
+            compute_slots.release()
         
         if not result.get('forward_primer') or not result.get('reverse_primer'):
             return jsonify({
@@ -272,16 +842,15 @@ def primers():
         
         return jsonify(result)
     
-    except Exception as e:
-        print(f"Error in primers endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in primers endpoint")
         return jsonify({'error': 'Internal server error. Please try again.'}), 500
 
 
 @app.route('/api/explain', methods=['POST'])
 def explain_with_ai():
     """Generate AI explanations using FREE Groq API with extended responses"""
+    claimed = False
     try:
         # Check if API key is configured
         if not GROQ_API_KEY:
@@ -290,9 +859,9 @@ def explain_with_ai():
                 'explanation': 'AI explanations are currently unavailable. The service needs to be configured with an API key.'
             }), 503
         
-        data = request.json
+        data = request.get_json(silent=True, cache=False)
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return NO_JSON_ERROR()
         
         tool = data.get('tool', 'Unknown Tool')
         results = data.get('data', {})
@@ -300,20 +869,37 @@ def explain_with_ai():
         if not results:
             return jsonify({'error': 'No data provided'}), 400
         
+        # Clients asking for text/event-stream get the explanation as it is generated
+        stream = request.accept_mimetypes.best_match(['application/json', 'text/event-stream']) == 'text/event-stream'
+        
         context = build_ai_context(tool, results)
+        cache_key = content_key(context)
+        
+        explanation = explanation_cache.get(cache_key)
+        if explanation is not None:
+            if stream:
+                return Response([sse_event({'content': explanation}), "data: [DONE]\n\n"],
+                                mimetype='text/event-stream')
+            return jsonify({'explanation': explanation, 'cached': True})
         
-        response = requests.post(
+        # A duplicate of a request already waiting on Groq reuses its result
+        if not stream:
+            pending = claim_explanation(cache_key)
+            claimed = pending is None
+            if pending is not None:
+                pending.wait(GROQ_TIMEOUT)
+                explanation = explanation_cache.get(cache_key)
+                if explanation is not None:
+                    return jsonify({'explanation': explanation, 'cached': True})
+        
+        response = groq_session.post(
             GROQ_API_URL,
-            headers={
-                'Authorization': f'Bearer {GROQ_API_KEY}',
-                'Content-Type': 'application/json'
-            },
             json={
-                'model': 'llama-3.3-70b-versatile',
+                'model': GROQ_MODEL,
                 'messages': [
                     {
                         'role': 'system',
-                        'content': 'You are an expert molecular biology assistant. Provide comprehensive, detailed explanations of scientific results. Include biological significance, practical implications, interpretation guidelines, and actionable recommendations. Use clear language that both students and researchers can understand. Be thorough but organized - use sections, examples, and specific details to make complex concepts accessible.'
+                        'content': GROQ_SYSTEM_PROMPT
                     },
                     {
                         'role': 'user',
@@ -321,21 +907,28 @@ def explain_with_ai():
                     }
                 ],
                 'max_tokens': 2500,
-                'temperature': 0.7
+                'temperature': 0.7,
+                'stream': stream
             },
-            timeout=45
+            timeout=GROQ_TIMEOUT,
+            stream=stream
         )
         
         if response.status_code != 200:
-            error_data = response.json()
+            error_data = parse_json(response.content)
             error_msg = error_data.get('error', {}).get('message', 'Unknown error')
-            print(f"Groq API error: {error_msg}")
+            logger.error("Groq API error: %s", error_msg)
             return jsonify({'error': f'AI service error: {error_msg}'}), response.status_code
         
-        result = response.json()
+        if stream:
+            return Response(stream_explanation(response, cache_key, tool), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
+        result = parse_json(response.content)
         explanation = result['choices'][0]['message']['content']
+        explanation_cache.put(cache_key, explanation)
         
-        print(f"AI explanation generated for {tool} (length: {len(explanation)} chars)")
+        logger.info("AI explanation generated for %s (length: %d chars)", tool, len(explanation))
         return jsonify({'explanation': explanation})
     
     except requests.exceptions.Timeout:
@@ -344,41 +937,39 @@ def explain_with_ai():
     except requests.exceptions.ConnectionError:
         return jsonify({'error': 'Could not connect to AI service. Check your internet connection.'}), 503
     
-    except Exception as e:
-        print(f"Error in AI explanation: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in AI explanation")
         return jsonify({'error': 'Internal error processing AI request.'}), 500
+    
+    finally:
+        if claimed:
+            release_explanation(cache_key)
 
 
-def build_ai_context(tool, results):
-    """Build detailed context string for AI based on tool type"""
-    
-    if tool == "PCR Primer Designer":
-        fwd = results.get('forward_primer', {})
-        rev = results.get('reverse_primer', {})
-        
-        return f"""I designed PCR primers for amplification. Please provide a comprehensive analysis:
+# AI prompt templates per tool, filled with str.format_map from the fields
+# that the matching _*_context_fields function extracts from the results
+AI_CONTEXT_TEMPLATES = {
+    "PCR Primer Designer": """I designed PCR primers for amplification. Please provide a comprehensive analysis:
 
 FORWARD PRIMER:
-- Sequence: {fwd.get('sequence', 'N/A')}
-- Melting Temperature (Tm): {fwd.get('tm', 'N/A')}°C
-- GC Content: {fwd.get('gc_content', 'N/A')}%
-- Quality Score: {fwd.get('quality_score', 'N/A')}/100
-- Quality Grade: {fwd.get('quality_grade', 'N/A')}
-- Issues: {', '.join(fwd.get('issues', [])) if fwd.get('issues') else 'None detected'}
+- Sequence: {fwd_sequence}
+- Melting Temperature (Tm): {fwd_tm}°C
+- GC Content: {fwd_gc_content}%
+- Quality Score: {fwd_quality_score}/100
+- Quality Grade: {fwd_quality_grade}
+- Issues: {fwd_issues}
 
 REVERSE PRIMER:
-- Sequence: {rev.get('sequence', 'N/A')}
-- Melting Temperature (Tm): {rev.get('tm', 'N/A')}°C
-- GC Content: {rev.get('gc_content', 'N/A')}%
-- Quality Score: {rev.get('quality_score', 'N/A')}/100
-- Quality Grade: {rev.get('quality_grade', 'N/A')}
-- Issues: {', '.join(rev.get('issues', [])) if rev.get('issues') else 'None detected'}
+- Sequence: {rev_sequence}
+- Melting Temperature (Tm): {rev_tm}°C
+- GC Content: {rev_gc_content}%
+- Quality Score: {rev_quality_score}/100
+- Quality Grade: {rev_quality_grade}
+- Issues: {rev_issues}
 
 AMPLICON DETAILS:
-- Product Size: {results.get('product_size', 'N/A')} bp
-- Tm Difference: {abs(fwd.get('tm', 0) - rev.get('tm', 0)):.1f}°C
+- Product Size: {product_size} bp
+- Tm Difference: {tm_difference:.1f}°C
 
 Please provide a detailed analysis covering:
 1. Overall primer quality assessment and suitability for PCR
@@ -387,34 +978,20 @@ Please provide a detailed analysis covering:
 4. Any potential issues (primer dimers, hairpins, mispriming risks)
 5. Recommended PCR conditions (annealing temperature, extension time)
 6. Troubleshooting suggestions if quality is suboptimal
-7. Best practices for using these primers"""
-    
-    elif tool == "Mutation Finder":
-        summary = results.get('summary', {})
-        mutations = results.get('mutations', [])
-        
-        mutation_details = []
-        for i, m in enumerate(mutations[:10], 1):
-            mutation_details.append(
-                f"{i}. Position {m.get('position')}: {m.get('type')} - "
-                f"{m.get('from_base', '?')} → {m.get('to_base', '?')} "
-                f"[{m.get('mutation_class', 'Unknown')}]"
-            )
-        
-        mutation_list = '\n'.join(mutation_details) if mutation_details else "No mutations detected"
-        
-        return f"""I performed comparative sequence analysis and found the following mutations:
+7. Best practices for using these primers""",
+
+    "Mutation Finder": """I performed comparative sequence analysis and found the following mutations:
 
 SUMMARY STATISTICS:
-- Total Mutations: {summary.get('total_mutations', 0)}
-- Single Nucleotide Polymorphisms (SNPs): {summary.get('snps', 0)}
-- Insertions: {summary.get('insertions', 0)}
-- Deletions: {summary.get('deletions', 0)}
+- Total Mutations: {total_mutations}
+- Single Nucleotide Polymorphisms (SNPs): {snps}
+- Insertions: {insertions}
+- Deletions: {deletions}
 
 FUNCTIONAL CLASSIFICATION:
-- Silent Mutations: {summary.get('silent_mutations', 0)}
-- Missense Mutations: {summary.get('missense_mutations', 0)}
-- Nonsense Mutations: {summary.get('nonsense_mutations', 0)}
+- Silent Mutations: {silent_mutations}
+- Missense Mutations: {missense_mutations}
+- Nonsense Mutations: {nonsense_mutations}
 
 DETAILED MUTATION LIST (showing first 10):
 {mutation_list}
@@ -426,24 +1003,9 @@ Please provide comprehensive analysis:
 4. Clinical or research implications
 5. Patterns or hotspots in the mutations
 6. Recommendations for follow-up analysis
-7. What these mutations might tell us about evolutionary relationships or disease"""
-    
-    elif tool == "CRISPR Finder":
-        sites_count = results.get('total_sites', 0)
-        forward = results.get('forward_strand_sites', 0)
-        reverse = results.get('reverse_strand_sites', 0)
-        sites = results.get('sites', [])
-        
-        site_details = []
-        for i, site in enumerate(sites[:8], 1):
-            site_details.append(
-                f"{i}. Position {site.get('position')}: {site.get('pam_sequence')} "
-                f"({site.get('strand')} strand, {site.get('cut_position')} bp from start)"
-            )
-        
-        site_list = '\n'.join(site_details) if site_details else "No PAM sites found"
-        
-        return f"""I analyzed a DNA sequence for CRISPR-Cas9 targeting sites:
+7. What these mutations might tell us about evolutionary relationships or disease""",
+
+    "CRISPR Finder": """I analyzed a DNA sequence for CRISPR-Cas9 targeting sites:
 
 SUMMARY:
 - Total PAM Sites Found: {sites_count}
@@ -461,21 +1023,20 @@ Please provide detailed explanation:
 5. Strand selection strategy (forward vs. reverse)
 6. Potential challenges and how to address them
 7. Best practices for experimental validation
-8. Tips for maximizing editing efficiency and specificity"""
-    
-    elif tool == "Sequence Alignment":
-        return f"""I performed sequence alignment with the following results:
+8. Tips for maximizing editing efficiency and specificity""",
+
+    "Sequence Alignment": """I performed sequence alignment with the following results:
 
 ALIGNMENT DETAILS:
-- Algorithm Used: {results.get('algorithm', 'N/A')}
-- Alignment Score: {results.get('score', 'N/A')}
-- Overall Similarity: {results.get('similarity_percentage', 'N/A')}%
+- Algorithm Used: {algorithm}
+- Alignment Score: {score}
+- Overall Similarity: {similarity_percentage}%
 
 DETAILED STATISTICS:
-- Matching Positions: {results.get('matches', 'N/A')}
-- Mismatched Positions: {results.get('mismatches', 'N/A')}
-- Gap Positions: {results.get('gaps', 'N/A')}
-- Total Alignment Length: {results.get('length', 'N/A')} positions
+- Matching Positions: {matches}
+- Mismatched Positions: {mismatches}
+- Gap Positions: {gaps}
+- Total Alignment Length: {length} positions
 
 Please provide comprehensive analysis:
 1. Interpretation of the alignment score and similarity percentage
@@ -485,21 +1046,20 @@ Please provide comprehensive analysis:
 5. Evolutionary insights from the alignment pattern
 6. Recommendations for further analysis
 7. How to use this information in research or diagnostics
-8. Confidence level and potential limitations of the alignment"""
-    
-    elif tool == "DNA Sequence Analyzer":
-        return f"""I performed comprehensive DNA sequence analysis:
+8. Confidence level and potential limitations of the alignment""",
+
+    "DNA Sequence Analyzer": """I performed comprehensive DNA sequence analysis:
 
 SEQUENCE CHARACTERISTICS:
-- Length: {results.get('length', 'N/A')} base pairs
-- GC Content: {results.get('gc_content', 'N/A')}%
-- AT Content: {results.get('at_content', 'N/A')}%
-- Melting Temperature (Tm): {results.get('tm', 'N/A')}°C
+- Length: {length} base pairs
+- GC Content: {gc_content}%
+- AT Content: {at_content}%
+- Melting Temperature (Tm): {tm}°C
 
 CODING POTENTIAL:
-- Open Reading Frames (ORFs) Detected: {results.get('orfs_found', 'N/A')}
-- Longest ORF: {results.get('longest_orf', {}).get('length_nt', 'N/A')} nucleotides
-  ({results.get('longest_orf', {}).get('length_aa', 'N/A')} amino acids)
+- Open Reading Frames (ORFs) Detected: {orfs_found}
+- Longest ORF: {longest_orf_nt} nucleotides
+  ({longest_orf_aa} amino acids)
 
 Please provide detailed interpretation:
 1. What the GC content reveals about the sequence (stability, gene density, organism type)
@@ -509,13 +1069,13 @@ Please provide detailed interpretation:
 5. Recommendations for molecular biology experiments
 6. Potential challenges or considerations
 7. How these metrics compare to typical sequences
-8. Next steps for characterization or functional analysis"""
-    
-    else:
-        return f"""Please provide a comprehensive, detailed explanation of these {tool} results:
+8. Next steps for characterization or functional analysis""",
+}
+
+AI_CONTEXT_FALLBACK = """Please provide a comprehensive, detailed explanation of these {tool} results:
 
 DATA:
-{str(results)[:1000]}
+{data}
 
 Include:
 1. Interpretation of key metrics and values
@@ -525,6 +1085,89 @@ Include:
 5. Potential applications or considerations"""
 
 
+def _primer_context_fields(results):
+    """PCR Primer Designer template fields"""
+    fields = {}
+    primers = {'fwd': results.get('forward_primer', {}), 'rev': results.get('reverse_primer', {})}
+    for prefix, primer in primers.items():
+        for key in ('sequence', 'tm', 'gc_content', 'quality_score', 'quality_grade'):
+            fields[f'{prefix}_{key}'] = primer.get(key, 'N/A')
+        fields[f'{prefix}_issues'] = ', '.join(primer.get('issues', [])) if primer.get('issues') else 'None detected'
+    fields['product_size'] = results.get('product_size', 'N/A')
+    fields['tm_difference'] = abs(primers['fwd'].get('tm', 0) - primers['rev'].get('tm', 0))
+    return fields
+
+
+def _mutation_context_fields(results):
+    """Mutation Finder template fields"""
+    summary = results.get('summary', {})
+    mutations = results.get('mutations', [])
+    
+    mutation_details = []
+    for i, m in enumerate(mutations[:10], 1):
+        mutation_details.append(
+            f"{i}. Position {m.get('position')}: {m.get('type')} - "
+            f"{m.get('from_base', '?')} → {m.get('to_base', '?')} "
+            f"[{m.get('mutation_class', 'Unknown')}]"
+        )
+    
+    fields = {key: summary.get(key, 0) for key in (
+        'total_mutations', 'snps', 'insertions', 'deletions',
+        'silent_mutations', 'missense_mutations', 'nonsense_mutations')}
+    fields['mutation_list'] = '\n'.join(mutation_details) if mutation_details else "No mutations detected"
+    return fields
+
+
+def _crispr_context_fields(results):
+    """CRISPR Finder template fields"""
+    sites = results.get('sites', [])
+    
+    site_details = []
+    for i, site in enumerate(sites[:8], 1):
+        site_details.append(
+            f"{i}. Position {site.get('position')}: {site.get('pam_sequence')} "
+            f"({site.get('strand')} strand, {site.get('cut_position')} bp from start)"
+        )
+    
+    return {
+        'sites_count': results.get('total_sites', 0),
+        'forward': results.get('forward_strand_sites', 0),
+        'reverse': results.get('reverse_strand_sites', 0),
+        'site_list': '\n'.join(site_details) if site_details else "No PAM sites found"
+    }
+
+
+def _alignment_context_fields(results):
+    """Sequence Alignment template fields"""
+    return {key: results.get(key, 'N/A') for key in (
+        'algorithm', 'score', 'similarity_percentage', 'matches', 'mismatches', 'gaps', 'length')}
+
+
+def _analyzer_context_fields(results):
+    """DNA Sequence Analyzer template fields"""
+    fields = {key: results.get(key, 'N/A') for key in ('length', 'gc_content', 'at_content', 'tm', 'orfs_found')}
+    fields['longest_orf_nt'] = results.get('longest_orf', {}).get('length_nt', 'N/A')
+    fields['longest_orf_aa'] = results.get('longest_orf', {}).get('length_aa', 'N/A')
+    return fields
+
+
+AI_CONTEXT_FIELDS = {
+    "PCR Primer Designer": _primer_context_fields,
+    "Mutation Finder": _mutation_context_fields,
+    "CRISPR Finder": _crispr_context_fields,
+    "Sequence Alignment": _alignment_context_fields,
+    "DNA Sequence Analyzer": _analyzer_context_fields,
+}
+
+
+def build_ai_context(tool, results):
+    """Build detailed context string for AI based on tool type"""
+    template = AI_CONTEXT_TEMPLATES.get(tool)
+    if template is None:
+        return AI_CONTEXT_FALLBACK.format(tool=tool, data=str(results)[:1000])
+    return template.format_map(AI_CONTEXT_FIELDS[tool](results))
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -541,8 +1184,10 @@ def health():
         'rate_limit': f'{MAX_REQUESTS_PER_WINDOW} requests per {RATE_LIMIT_WINDOW}s',
         'endpoints': {
             'mutations': '/api/mutations',
+            'mutations_batch': '/api/mutations/batch',
             'alignment': '/api/align',
             'crispr': '/api/crispr',
+            'crispr_batch': '/api/crispr/batch',
             'primers': '/api/primers',
             'explain': '/api/explain',
             'health': '/api/health'
@@ -582,8 +1227,10 @@ def not_found(error):
         'error': 'Endpoint not found',
         'available_endpoints': [
             '/api/mutations',
+            '/api/mutations/batch',
             '/api/align',
             '/api/crispr',
+            '/api/crispr/batch',
             '/api/primers',
             '/api/explain',
             '/api/health',
@@ -597,6 +1244,11 @@ def method_not_allowed(error):
     return jsonify({'error': 'Method not allowed. Check the HTTP method.'}), 405
 
 
+@app.errorhandler(413)
+def request_too_large(error):
+    return REQUEST_TOO_LARGE_ERROR()
+
+
 @app.errorhandler(429)
 def rate_limit_exceeded(error):
     return jsonify({
@@ -624,8 +1276,10 @@ if __name__ == '__main__':
     print("=" * 70)
     print("\nAvailable Endpoints:")
     print("  POST /api/mutations    - Find mutations between sequences")
+    print("  POST /api/mutations/batch - Find mutations for several sequence pairs")
     print("  POST /api/align        - Perform sequence alignment")
     print("  POST /api/crispr       - Find CRISPR PAM sites")
+    print("  POST /api/crispr/batch - Find CRISPR PAM sites in several sequences")
     print("  POST /api/primers      - Design PCR primers")
     print("  POST /api/explain      - Get AI explanations (if enabled)")
     print("  GET  /api/health       - Health check")
@@ -637,5 +1291,7 @@ if __name__ == '__main__':
         print("   To enable: Add GROQ_API_KEY to your .env file\n")
     
     print("\n✅ Server ready to accept requests!\n")
+    print("   Development server only; for production run:")
+    print("   gunicorn -c gunicorn_conf.py app:app\n")
     
-    app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', port=5000, host='0.0.0.0')
\ No newline at end of file
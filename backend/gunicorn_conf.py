@@ -0,0 +1,63 @@
+"""
+Gunicorn settings for running the backend in production:
+    gunicorn -c gunicorn_conf.py app:app
+
+gevent workers let one slow Groq request in /api/explain wait without
+blocking the other endpoints; without gevent, threaded workers are used.
+The app is imported and its numba kernels compiled once in the master,
+then shared with forked workers. Workers can also be pinned to one CPU each.
+Every setting can be overridden with the environment variables below.
+"""
+
+import multiprocessing
+import os
+
+try:
+    import gevent  # noqa: F401
+    HAVE_GEVENT = True
+except ImportError:
+    HAVE_GEVENT = False
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent' if HAVE_GEVENT else 'gthread')
+
+# Concurrent requests per worker: greenlets for gevent, threads for gthread
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Long enough for a full AI explanation to be generated
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+
+# Split the CPUs between the workers' batch process pools
+os.environ.setdefault('BATCH_POOL_WORKERS', str(max(1, multiprocessing.cpu_count() // workers)))
+
+# Import and JIT-compile the algorithms once, before forking workers
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Opt-in: keep each worker's DP matrices in one core's cache. A pinned
+# worker's numba thread pool would share that core, so it gets one thread
+pin_workers = os.environ.get('GUNICORN_PIN_WORKERS', '0') == '1'
+if pin_workers:
+    os.environ.setdefault('NUMBA_NUM_THREADS', '1')
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Compile the endpoints' kernels in the preloaded app before workers fork"""
+    if preload_app:
+        import app
+        app.warm_up()
+
+
+def post_fork(server, worker):
+    """Pin the new worker to one of the CPUs available to the server"""
+    if not pin_workers or not hasattr(os, 'sched_setaffinity'):
+        return
+    cpus = sorted(os.sched_getaffinity(0))
+    cpu = cpus[worker.age % len(cpus)]
+    os.sched_setaffinity(0, {cpu})
+    server.log.info("Worker %s pinned to CPU %s", worker.pid, cpu)
@@ -0,0 +1,15 @@
+"""
+Build the optional C alignment extension in place:
+    python setup.py build_ext --inplace
+
+The backend runs without it; alignment.py uses numba or plain Python instead.
+"""
+
+from setuptools import Extension, setup
+
+setup(
+    name='dna-analyzer-backend',
+    ext_modules=[
+        Extension('algorithms._align_simd', ['algorithms/_align_simd.c']),
+    ],
+)
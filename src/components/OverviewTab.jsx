@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { API_ENDPOINTS } from '../utils/config';
+import { streamAIExplanation } from '../utils/apiUtils';
 
 export default function OverviewTab({ result, originalSequence }) {
   const [showCodonTable, setShowCodonTable] = useState(false);
@@ -14,34 +14,19 @@ export default function OverviewTab({ result, originalSequence }) {
     setLoadingAI(true);
     
     try {
-      const response = await fetch(API_ENDPOINTS.explain, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          tool: 'DNA Sequence Analyzer',
-          data: {
-            length: result.length,
-            gc_content: result.gc,
-            at_content: result.at,
-            tm: result.tm,
-            molecular_weight: result.molecularWeight,
-            nucleotides: result.nucleotides,
-            orfs_found: result.nORFs,
-            longest_orf: result.longestORF,
-            restriction_sites_count: result.restrictionSites?.length || 0
-          }
-        })
-      });
+      const explanation = await streamAIExplanation('DNA Sequence Analyzer', {
+        length: result.length,
+        gc_content: result.gc,
+        at_content: result.at,
+        tm: result.tm,
+        molecular_weight: result.molecularWeight,
+        nucleotides: result.nucleotides,
+        orfs_found: result.nORFs,
+        longest_orf: result.longestORF,
+        restriction_sites_count: result.restrictionSites?.length || 0
+      }, setAiExplanation);
 
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-      }
-
-      const data = await response.json();
-      
-      if (data.explanation) {
-        setAiExplanation(data.explanation);
-      } else {
+      if (!explanation) {
         setAiExplanation('No explanation available from AI.');
       }
       
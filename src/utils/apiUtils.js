@@ -135,6 +135,61 @@ export async function getAIExplanation(tool, data) {
   });
 }
 
+/**
+ * Stream an AI explanation, calling onText with the text received so far.
+ * EventSource cannot POST, so the server-sent events are read from fetch.
+ */
+export async function streamAIExplanation(tool, data, onText) {
+  const response = await fetch(API_ENDPOINTS.explain, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Accept': 'text/event-stream',
+    },
+    body: JSON.stringify({ tool, data }),
+  });
+
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+  }
+
+  // A server that does not stream answers with the whole explanation as JSON
+  const contentType = response.headers.get('content-type');
+  if (!contentType || !contentType.includes('text/event-stream')) {
+    const result = await response.json();
+    const explanation = result.explanation || '';
+    onText(explanation);
+    return explanation;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let text = '';
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split('\n\n');
+    buffer = events.pop();
+
+    for (const event of events) {
+      if (!event.startsWith('data: ')) continue;
+      const payload = event.slice('data: '.length);
+      if (payload === '[DONE]') return text;
+
+      const message = JSON.parse(payload);
+      if (message.error) throw new Error(message.error);
+      text += message.content || '';
+      onText(text);
+    }
+  }
+
+  return text;
+}
+
 /**
  * Check API health status
  */
@@ -206,6 +261,7 @@ export default {
   findCRISPRSites,
   designPrimers,
   getAIExplanation,
+  streamAIExplanation,
   checkHealth,
   getAPIInfo,
   validateSequence,